@@ -2,4 +2,25 @@
 
 from __future__ import annotations
 
-from lesson_generator.graph import create_lesson_graph
+import typing as t
+
+if t.TYPE_CHECKING:
+    from lesson_generator.graph import create_lesson_graph
+
+__all__ = ("create_lesson_graph",)
+
+
+def __getattr__(name: str) -> t.Any:
+    """Import the graph factory on first access.
+
+    ``python -m lesson_generator`` imports this package before the CLI
+    runs, so the graph module (and Pydantic, via its state schema) is only
+    loaded when something actually asks for it.
+    """
+    if name == "create_lesson_graph":
+        from lesson_generator.graph import create_lesson_graph
+
+        globals()[name] = create_lesson_graph
+        return create_lesson_graph
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
@@ -13,7 +13,8 @@ import pathlib
 import sys
 import typing as t
 
-from dotenv import load_dotenv
+#: Flags that never reach the LLM pipeline, so ``.env`` loading is skipped.
+_NO_DOTENV_FLAGS = frozenset({"-h", "--help", "--list-domains"})
 
 
 def _build_parser() -> argparse.ArgumentParser:
@@ -65,20 +66,24 @@ def _build_parser() -> argparse.ArgumentParser:
 
 def main() -> None:
     """Run the lesson generator CLI."""
-    load_dotenv()
+    if _NO_DOTENV_FLAGS.isdisjoint(sys.argv[1:]):
+        from dotenv import load_dotenv
+
+        load_dotenv()
 
     parser = _build_parser()
     args = parser.parse_args()
 
     # Lazy imports to avoid loading LangChain/LangGraph for --list-domains
-    from lesson_generator.domains import get_domain, list_domains
-
     if args.list_domains:
-        for name in list_domains():
-            domain = get_domain(name)
-            print(f"  {name}: {domain.pedagogy.value} ({domain.project_type.value})")
+        from lesson_generator.domains import list_domain_summaries
+
+        for name, pedagogy, project_type in list_domain_summaries():
+            print(f"  {name}: {pedagogy} ({project_type})")
         sys.exit(0)
 
+    from lesson_generator.domains import get_domain
+
     if not args.domain or not args.topic:
         parser.error("--domain and --topic are required.")
 
@@ -1,18 +1,36 @@
-"""Static domain registry for lesson generation."""
+"""Static domain registry for lesson generation.
+
+Built-in domains are declared as plain keyword-argument specs and only
+turned into :class:`~lesson_generator.models.DomainConfig` instances the
+first time :func:`get_domain` asks for them.
+"""
 
 from __future__ import annotations
 
+import functools
 import os
 import pathlib
+import typing as t
+
+from lesson_generator.models import PedagogyStyle, ProjectType
 
-from lesson_generator.models import DomainConfig, PedagogyStyle, ProjectType
+if t.TYPE_CHECKING:
+    from lesson_generator.models import DomainConfig
 
+#: Materialized configs: built-in domains on first lookup, plus anything
+#: added through :func:`_register`.
 _REGISTRY: dict[str, DomainConfig] = {}
 
-# Default study root for resolving project paths
-_STUDY_ROOT = pathlib.Path(
-    os.environ.get("LESSON_STUDY_ROOT", str(pathlib.Path.home() / "study" / "python"))
-)
+
+@functools.cache
+def _study_root() -> pathlib.Path:
+    """Return the default study root for resolving project paths."""
+    return pathlib.Path(
+        os.environ.get(
+            "LESSON_STUDY_ROOT",
+            str(pathlib.Path.home() / "study" / "python"),
+        ),
+    )
 
 
 def _register(config: DomainConfig) -> None:
@@ -20,9 +38,31 @@ def _register(config: DomainConfig) -> None:
     _REGISTRY[config.name] = config
 
 
+def _build_builtin(name: str) -> DomainConfig:
+    """Construct the config for a built-in domain from its spec.
+
+    ``project_path`` in a spec is relative to :func:`_study_root`, and
+    ``source_refs`` values may start with ``~``.
+    """
+    from lesson_generator.models import DomainConfig
+
+    spec = dict(_DOMAIN_SPECS[name])
+    spec["project_path"] = _study_root() / spec["project_path"]
+    spec["source_refs"] = {
+        ref: str(pathlib.Path(path).expanduser())
+        for ref, path in spec["source_refs"].items()
+    }
+    return DomainConfig(name=name, **spec)
+
+
 def get_domain(name: str) -> DomainConfig:
     """Look up a domain by name.
 
+    The first lookup of a built-in domain validates its spec; every later
+    lookup (one per graph node) returns the same instance from
+    ``_REGISTRY``.  The registry is used instead of ``functools.cache``
+    because :func:`_register` may replace an entry at any time.
+
     Parameters
     ----------
     name : str
@@ -38,11 +78,15 @@ def get_domain(name: str) -> DomainConfig:
     KeyError
         If the domain is not registered.
     """
-    if name not in _REGISTRY:
-        available = ", ".join(sorted(_REGISTRY))
+    config = _REGISTRY.get(name)
+    if config is not None:
+        return config
+    if name not in _DOMAIN_SPECS:
+        available = ", ".join(list_domains())
         msg = f"Unknown domain {name!r}. Available: {available}"
         raise KeyError(msg)
-    return _REGISTRY[name]
+    config = _REGISTRY[name] = _build_builtin(name)
+    return config
 
 
 def list_domains() -> list[str]:
@@ -53,7 +97,29 @@ def list_domains() -> list[str]:
     list[str]
         Available domain names.
     """
-    return sorted(_REGISTRY)
+    return sorted(_REGISTRY.keys() | _DOMAIN_SPECS.keys())
+
+
+def list_domain_summaries() -> list[tuple[str, str, str]]:
+    """Return ``(name, pedagogy, project_type)`` for every registered domain.
+
+    Built-in domains are summarized from their specs, so no
+    :class:`~lesson_generator.models.DomainConfig` is constructed.
+
+    Returns
+    -------
+    list[tuple[str, str, str]]
+        Plain-string summaries sorted by domain name.
+    """
+    summaries = {
+        name: (spec["pedagogy"].value, spec["project_type"].value)
+        for name, spec in _DOMAIN_SPECS.items()
+    }
+    summaries.update(
+        (name, (config.pedagogy.value, config.project_type.value))
+        for name, config in _REGISTRY.items()
+    )
+    return [(name, *summaries[name]) for name in sorted(summaries)]
 
 
 def validate_environment(config: DomainConfig) -> tuple[bool, str]:
@@ -87,34 +153,25 @@ def validate_environment(config: DomainConfig) -> tuple[bool, str]:
 # MVP domains
 # ---------------------------------------------------------------------------
 
-_register(
-    DomainConfig(
-        name="dsa",
-        pedagogy=PedagogyStyle.CONCEPT_FIRST,
-        project_type=ProjectType.LESSON_BASED,
-        project_path=_STUDY_ROOT / "learning-dsa",
-        lesson_dir="src/algorithms",
-        template_path="notes/lesson_template.py",
-        source_refs={
-            "cpython": str(pathlib.Path.home() / "study" / "c" / "cpython"),
-        },
-        strict_mypy=True,
-        doctest_strategy="deterministic",
-    ),
-)
-
-_register(
-    DomainConfig(
-        name="asyncio",
-        pedagogy=PedagogyStyle.CONCEPT_FIRST,
-        project_type=ProjectType.LESSON_BASED,
-        project_path=_STUDY_ROOT / "learning-asyncio",
-        lesson_dir="src",
-        template_path="notes/lesson_template.py",
-        source_refs={
-            "cpython": str(pathlib.Path.home() / "study" / "c" / "cpython"),
-        },
-        strict_mypy=True,
-        doctest_strategy="ellipsis",
-    ),
-)
+_DOMAIN_SPECS: dict[str, dict[str, t.Any]] = {
+    "dsa": {
+        "pedagogy": PedagogyStyle.CONCEPT_FIRST,
+        "project_type": ProjectType.LESSON_BASED,
+        "project_path": "learning-dsa",
+        "lesson_dir": "src/algorithms",
+        "template_path": "notes/lesson_template.py",
+        "source_refs": {"cpython": "~/study/c/cpython"},
+        "strict_mypy": True,
+        "doctest_strategy": "deterministic",
+    },
+    "asyncio": {
+        "pedagogy": PedagogyStyle.CONCEPT_FIRST,
+        "project_type": ProjectType.LESSON_BASED,
+        "project_path": "learning-asyncio",
+        "lesson_dir": "src",
+        "template_path": "notes/lesson_template.py",
+        "source_refs": {"cpython": "~/study/c/cpython"},
+        "strict_mypy": True,
+        "doctest_strategy": "ellipsis",
+    },
+}
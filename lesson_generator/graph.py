@@ -1,22 +1,21 @@
-"""LangGraph state graph construction for lesson generation."""
+"""LangGraph state graph construction for lesson generation.
+
+LangChain, LangGraph, and the node functions are imported inside the
+builders so that importing this module (``langgraph.json``, the CLI's
+``--help``/``--list-domains``) stays cheap.
+"""
 
 from __future__ import annotations
 
 import typing as t
 
-from langchain_anthropic import ChatAnthropic
-from langchain_core.language_models import BaseChatModel
-from langgraph.graph import END, START, StateGraph
-from langgraph.graph.state import CompiledStateGraph
+# Module scope on purpose: LangGraph resolves ``_should_retry``'s annotations
+# via ``typing.get_type_hints`` against this module's globals.
+from lesson_generator.state import LessonGeneratorState
 
-from lesson_generator.nodes import (
-    load_context,
-    make_fix_node,
-    make_generate_node,
-    validate_lesson,
-    write_output,
-)
-from lesson_generator.state import LessonGeneratorInput, LessonGeneratorState
+if t.TYPE_CHECKING:
+    from langchain_core.language_models import BaseChatModel
+    from langgraph.graph.state import CompiledStateGraph
 
 _RetryRoute = t.Literal["write_output", "fix_lesson"]
 
@@ -56,6 +55,17 @@ def _build_graph(
     CompiledStateGraph
         Compiled LangGraph ready for invocation.
     """
+    from langgraph.graph import END, START, StateGraph
+
+    from lesson_generator.models import LessonGeneratorInput
+    from lesson_generator.nodes import (
+        load_context,
+        make_fix_node,
+        make_generate_node,
+        validate_lesson,
+        write_output,
+    )
+
     generate_lesson = make_generate_node(model)
     fix_lesson = make_fix_node(model)
 
@@ -89,5 +99,7 @@ def create_lesson_graph() -> CompiledStateGraph:  # type: ignore[type-arg]
     CompiledStateGraph
         Compiled LangGraph ready for invocation.
     """
+    from langchain_anthropic import ChatAnthropic
+
     model = ChatAnthropic(model="claude-sonnet-4-5")  # type: ignore[call-arg]
     return _build_graph(model)
@@ -0,0 +1,45 @@
+"""Data models for the lesson generation system.
+
+The enums are plain stdlib and imported eagerly.  The Pydantic models are
+resolved on first attribute access so that importing this package (and
+:mod:`lesson_generator.domains`) does not import Pydantic.
+"""
+
+from __future__ import annotations
+
+import typing as t
+
+from lesson_generator.models._enums import PedagogyStyle, ProjectType
+
+if t.TYPE_CHECKING:
+    from lesson_generator.models._schemas import (
+        DomainConfig,
+        LessonGeneratorInput,
+        LessonMetadata,
+        ValidationResult,
+    )
+
+__all__ = (
+    "DomainConfig",
+    "LessonGeneratorInput",
+    "LessonMetadata",
+    "PedagogyStyle",
+    "ProjectType",
+    "ValidationResult",
+)
+
+_LAZY_SCHEMAS = frozenset(
+    {"DomainConfig", "LessonGeneratorInput", "LessonMetadata", "ValidationResult"},
+)
+
+
+def __getattr__(name: str) -> t.Any:
+    """Import Pydantic-backed models on first access."""
+    if name in _LAZY_SCHEMAS:
+        from lesson_generator.models import _schemas
+
+        value = getattr(_schemas, name)
+        globals()[name] = value
+        return value
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
@@ -0,0 +1,31 @@
+"""Enumerations for the lesson generation system (stdlib only)."""
+
+from __future__ import annotations
+
+import enum
+
+
+class PedagogyStyle(enum.StrEnum):
+    """Teaching approach for content generation.
+
+    Each style maps to a different lesson structure and emphasis.
+    """
+
+    CONCEPT_FIRST = "concept_first"
+    """DSA, asyncio: heavy doctests, pure Python, algorithmic focus."""
+
+    INTEGRATION_FIRST = "integration_first"
+    """LangChain, LangGraph, ADK: framework integration patterns."""
+
+    APPLICATION_FIRST = "application_first"
+    """Litestar, FastAPI: functioning server/app with tests."""
+
+
+class ProjectType(enum.StrEnum):
+    """Structure of the target learning project."""
+
+    LESSON_BASED = "lesson_based"
+    """Numbered lesson files (NNN_topic.py) with doctests."""
+
+    APP_BASED = "app_based"
+    """Application structure (src/app/ + tests/)."""
@@ -1,37 +1,18 @@
-"""Data models for the lesson generation system."""
+"""Pydantic data models for the lesson generation system.
+
+Every model sets ``defer_build=True``: its validator and serializer are
+built on first use rather than at import, so a run only pays for the
+models it actually touches.
+"""
 
 from __future__ import annotations
 
-import enum
 import pathlib
 
-from pydantic import BaseModel, Field
-
-
-class PedagogyStyle(enum.StrEnum):
-    """Teaching approach for content generation.
-
-    Each style maps to a different lesson structure and emphasis.
-    """
-
-    CONCEPT_FIRST = "concept_first"
-    """DSA, asyncio: heavy doctests, pure Python, algorithmic focus."""
-
-    INTEGRATION_FIRST = "integration_first"
-    """LangChain, LangGraph, ADK: framework integration patterns."""
-
-    APPLICATION_FIRST = "application_first"
-    """Litestar, FastAPI: functioning server/app with tests."""
-
-
-class ProjectType(enum.StrEnum):
-    """Structure of the target learning project."""
+from pydantic import BaseModel, ConfigDict, Field
 
-    LESSON_BASED = "lesson_based"
-    """Numbered lesson files (NNN_topic.py) with doctests."""
-
-    APP_BASED = "app_based"
-    """Application structure (src/app/ + tests/)."""
+from lesson_generator.models._enums import PedagogyStyle, ProjectType
+from lesson_generator.state import DomainName
 
 
 class DomainConfig(BaseModel):
@@ -60,6 +41,8 @@ class DomainConfig(BaseModel):
         or ``"skip"``.
     """
 
+    model_config = ConfigDict(defer_build=True)
+
     name: str
     pedagogy: PedagogyStyle
     project_type: ProjectType
@@ -88,6 +71,8 @@ class LessonMetadata(BaseModel):
         Brief narrative context for the lesson.
     """
 
+    model_config = ConfigDict(defer_build=True)
+
     number: int
     title: str
     filename: str
@@ -111,7 +96,46 @@ class ValidationResult(BaseModel):
         did not change the code.
     """
 
+    model_config = ConfigDict(defer_build=True)
+
     is_valid: bool
     errors: list[str] = Field(default_factory=list)
     tools_run: list[str] = Field(default_factory=list)
     normalized_code: str | None = None
+
+
+class LessonGeneratorInput(BaseModel):
+    """Input schema for the lesson generation graph.
+
+    Defines the fields that callers (CLI, Studio UI) must or may provide
+    when invoking the graph.  Uses Pydantic ``BaseModel`` so that
+    LangGraph Studio renders descriptions and enum dropdowns.
+    """
+
+    model_config = ConfigDict(defer_build=True)
+
+    topic: str = Field(
+        description="Lesson topic, e.g. 'hash tables'",
+    )
+    domain_name: DomainName = Field(
+        description="Learning domain to generate a lesson for",
+    )
+    target_dir: str | None = Field(
+        default=None,
+        description=(
+            "Output directory"
+            " (defaults to temp dir: {tempdir}/lesson-generator/{user}/{domain}/)"
+        ),
+    )
+    max_iterations: int = Field(
+        default=3,
+        description="Max generation/fix retry attempts",
+    )
+    dry_run: bool = Field(
+        default=False,
+        description="Validate only, don't write to disk",
+    )
+    force: bool = Field(
+        default=False,
+        description="Overwrite existing lesson files",
+    )
@@ -7,15 +7,13 @@ are created as closures inside :func:`make_generation_nodes`.
 
 from __future__ import annotations
 
+import pathlib
 import re
 import typing as t
 from collections.abc import Callable
 
-from langchain_core.language_models import BaseChatModel
-
 from lesson_generator.domains import get_domain
-from lesson_generator.models import LessonMetadata
-from lesson_generator.prompts import FIX_LESSON_PROMPT, GENERATE_LESSON_PROMPT
+from lesson_generator.prompts import get_fix_prompt, get_generate_prompt
 from lesson_generator.state import LessonGeneratorState
 from lesson_generator.tools import (
     list_existing_lessons,
@@ -26,11 +24,24 @@ from lesson_generator.tools import (
     write_lesson,
 )
 
-# Compiled regexes for stripping markdown code fences from LLM output.
-# Both must match for stripping to occur — prevents false positives from
-# backticks inside docstrings or inline code.
-_OPENING_FENCE_RE = re.compile(r"^`{3,}[^\S\n]*\w*[^\S\n]*\n", re.ASCII)
-_CLOSING_FENCE_RE = re.compile(r"\n[^\S\n]*`{3,}[^\S\n]*$", re.ASCII)
+if t.TYPE_CHECKING:
+    from langchain_core.language_models import BaseChatModel
+
+# Compiled regex for stripping markdown code fences from LLM output.
+# The opening and closing fences are matched together in one anchored pass,
+# so stripping only occurs when both are present — prevents false positives
+# from backticks inside docstrings or inline code.
+_FENCED_CODE_RE = re.compile(
+    r"\A`{3,}[^\S\n]*\w*[^\S\n]*\n(.*?)\n[^\S\n]*`{3,}[^\S\n]*\Z",
+    re.ASCII | re.DOTALL,
+)
+
+# Byte translation table for lesson-topic filenames: every byte outside
+# ``[a-z0-9_]`` maps to ``_``.
+_SAFE_TOPIC_BYTES = b"abcdefghijklmnopqrstuvwxyz0123456789_"
+_TOPIC_TRANSLATION = bytes(
+    b if b in _SAFE_TOPIC_BYTES else ord("_") for b in range(256)
+)
 
 
 def _strip_code_fences(text: str) -> str:
@@ -51,12 +62,60 @@ def _strip_code_fences(text: str) -> str:
         Code with outer fences removed (if matched) and whitespace trimmed.
     """
     stripped = text.strip()
-    if _OPENING_FENCE_RE.search(stripped) and _CLOSING_FENCE_RE.search(stripped):
-        stripped = _OPENING_FENCE_RE.sub("", stripped, count=1)
-        stripped = _CLOSING_FENCE_RE.sub("", stripped, count=1)
+    # Fast path: the prompts forbid fences, so most responses skip the regex.
+    if not stripped.startswith("`"):
+        return stripped
+    m = _FENCED_CODE_RE.match(stripped)
+    if m:
+        stripped = m.group(1)
     return stripped.strip()
 
 
+def _safe_topic(topic: str) -> str:
+    """Turn a lesson topic into a filename-safe slug.
+
+    Lowercases, replaces every character outside ``[a-z0-9_]`` with
+    ``_``, collapses underscore runs, and trims them from both ends.
+
+    Parameters
+    ----------
+    topic : str
+        Free-form lesson topic.
+
+    Returns
+    -------
+    str
+        Slug made of ``[a-z0-9_]`` only.
+    """
+    # Non-ASCII code points become a single ``?`` each, which the table
+    # then maps to ``_`` like any other unsafe character.
+    raw = topic.lower().encode("ascii", "replace").translate(_TOPIC_TRANSLATION)
+    return "_".join(part for part in raw.decode("ascii").split("_") if part)
+
+
+def _output_dir(state: LessonGeneratorState) -> pathlib.Path:
+    """Return the resolved output directory for this run.
+
+    Uses ``resolved_target_dir`` from :func:`load_context` when present,
+    so the path is only resolved once per pipeline run.
+
+    Parameters
+    ----------
+    state : LessonGeneratorState
+        Current pipeline state.
+
+    Returns
+    -------
+    pathlib.Path
+        Absolute output directory with symlinks resolved.
+    """
+    resolved = state.get("resolved_target_dir")
+    if resolved is not None:
+        return pathlib.Path(resolved)
+    config = get_domain(state["domain_name"])
+    return resolve_output_dir(config, target_dir=state.get("target_dir")).resolve()
+
+
 def load_context(state: LessonGeneratorState) -> dict[str, t.Any]:
     """Load template and existing lessons for the domain.
 
@@ -69,7 +128,7 @@ def load_context(state: LessonGeneratorState) -> dict[str, t.Any]:
     -------
     dict[str, Any]
         State updates: ``template_content``, ``existing_lessons``,
-        ``iteration``, ``status``.
+        ``resolved_target_dir``, ``iteration``, ``status``.
     """
     config = get_domain(state["domain_name"])
     template = read_template(config)
@@ -77,6 +136,7 @@ def load_context(state: LessonGeneratorState) -> dict[str, t.Any]:
     return {
         "template_content": template,
         "existing_lessons": existing,
+        "resolved_target_dir": str(_output_dir(state)),
         "iteration": 0,
         "status": "pending",
     }
@@ -101,14 +161,11 @@ def make_generate_node(
     def generate_lesson(state: LessonGeneratorState) -> dict[str, t.Any]:
         """Generate a Python lesson using the LLM."""
         config = get_domain(state["domain_name"])
-        output_dir = resolve_output_dir(config, target_dir=state.get("target_dir"))
-        number = merged_next_lesson_number(config, output_dir)
-        safe_topic = re.sub(r"[^a-z0-9_]", "_", state["topic"].lower())
-        safe_topic = re.sub(r"_+", "_", safe_topic).strip("_")
-        filename = f"{number:03d}_{safe_topic}.py"
+        number = merged_next_lesson_number(config, _output_dir(state))
+        filename = f"{number:03d}_{_safe_topic(state['topic'])}.py"
         existing_str = "\n".join(state.get("existing_lessons", [])) or "(none)"
 
-        chain = GENERATE_LESSON_PROMPT | model
+        chain = get_generate_prompt() | model
         result = chain.invoke(
             {
                 "template": state.get("template_content", ""),
@@ -121,16 +178,13 @@ def make_generate_node(
         )
         code = _strip_code_fences(str(result.content))
 
-        # Build metadata
-        metadata = LessonMetadata(
-            number=number,
-            title=state["topic"],
-            filename=filename,
-        )
-
         return {
             "rendered_code": code,
-            "metadata_json": metadata.model_dump_json(),
+            "metadata": {
+                "number": number,
+                "title": state["topic"],
+                "filename": filename,
+            },
             "status": "generated",
         }
 
@@ -185,7 +239,7 @@ def make_fix_node(
     def fix_lesson(state: LessonGeneratorState) -> dict[str, t.Any]:
         """Ask the LLM to fix validation errors in the code."""
         errors_str = "\n".join(state.get("validation_errors", []))
-        chain = FIX_LESSON_PROMPT | model
+        chain = get_fix_prompt() | model
         result = chain.invoke(
             {
                 "code": state["rendered_code"],
@@ -221,11 +275,12 @@ def write_output(state: LessonGeneratorState) -> dict[str, t.Any]:
     if state.get("dry_run"):
         return {"status": "dry_run"}
 
-    metadata = LessonMetadata.model_validate_json(state["metadata_json"])
-    config = get_domain(state["domain_name"])
-    target_dir = resolve_output_dir(config, target_dir=state.get("target_dir"))
-    target = (target_dir / metadata.filename).resolve()
-    if not target.is_relative_to(target_dir.resolve()):
+    filename = state["metadata"]["filename"]
+    target_dir = _output_dir(state)
+    # target_dir is already resolved; the target still is, so a planted
+    # symlink pointing outside target_dir is caught too.
+    target = (target_dir / filename).resolve()
+    if not target.is_relative_to(target_dir):
         return {"status": "failed", "validation_errors": ["Path traversal detected"]}
     try:
         write_lesson(target, state["rendered_code"], force=state.get("force", False))
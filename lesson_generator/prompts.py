@@ -1,76 +1,129 @@
-"""Prompt templates for lesson generation and correction."""
+"""Prompt templates for lesson generation and correction.
+
+The message tuples are plain module constants; the
+:class:`~langchain_core.prompts.ChatPromptTemplate` objects are built on
+first use so importing this module does not parse templates or import
+LangChain.  The ``GENERATE_LESSON_PROMPT`` and ``FIX_LESSON_PROMPT`` names
+are kept as lazy aliases for the cached getters' results.
+"""
 
 from __future__ import annotations
 
-from langchain_core.prompts import ChatPromptTemplate
+import functools
+import typing as t
+
+if t.TYPE_CHECKING:
+    from langchain_core.prompts import ChatPromptTemplate
 
-GENERATE_LESSON_PROMPT = ChatPromptTemplate.from_messages(
-    [
+    GENERATE_LESSON_PROMPT: ChatPromptTemplate
+    FIX_LESSON_PROMPT: ChatPromptTemplate
+
+_GENERATE_MESSAGES: list[tuple[str, str]] = [
+    (
+        "system",
         (
-            "system",
-            (
-                "You are an expert Python instructor creating learning content.\n\n"
-                "CONVENTIONS (must follow):\n"
-                "- Use `from __future__ import annotations` at the top\n"
-                "- Use namespace imports for stdlib: `import typing as t`, "
-                "`import pathlib`, etc.\n"
-                "- Exception: `from dataclasses import dataclass, field` is OK\n"
-                "- NumPy-style docstrings on all public functions\n"
-                "- Type hints on all functions (mypy --strict compatible)\n"
-                "- Include doctests in Examples sections\n"
-                "- Ensure `pytest --doctest-modules` passes\n"
-                "- Keep lessons self-contained and runnable\n"
-                "- Include a `main()` function and "
-                "`if __name__ == '__main__'` guard\n\n"
-                "TEMPLATE (follow this structure):\n"
-                "`````\n{template}\n`````\n\n"
-                "EXISTING LESSONS in this project (avoid overlap):\n"
-                "{existing_lessons}\n\n"
-                "The lesson number is {number} and filename is {filename}."
-            ),
+            "You are an expert Python instructor creating learning content.\n\n"
+            "CONVENTIONS (must follow):\n"
+            "- Use `from __future__ import annotations` at the top\n"
+            "- Use namespace imports for stdlib: `import typing as t`, "
+            "`import pathlib`, etc.\n"
+            "- Exception: `from dataclasses import dataclass, field` is OK\n"
+            "- NumPy-style docstrings on all public functions\n"
+            "- Type hints on all functions (mypy --strict compatible)\n"
+            "- Include doctests in Examples sections\n"
+            "- Ensure `pytest --doctest-modules` passes\n"
+            "- Keep lessons self-contained and runnable\n"
+            "- Include a `main()` function and "
+            "`if __name__ == '__main__'` guard\n\n"
+            "TEMPLATE (follow this structure):\n"
+            "`````\n{template}\n`````\n\n"
+            "EXISTING LESSONS in this project (avoid overlap):\n"
+            "{existing_lessons}\n\n"
+            "The lesson number is {number} and filename is {filename}."
         ),
+    ),
+    (
+        "human",
         (
-            "human",
-            (
-                "Generate a complete, self-contained Python lesson on: {topic}\n\n"
-                "Domain: {domain_name}\n\n"
-                "OUTPUT RULES:\n"
-                "1. Return ONLY valid Python source code\n"
-                "2. Do NOT wrap the output in markdown code fences "
-                "(no ``` or ```python)\n"
-                "3. The first line must be a Python docstring or comment"
-            ),
+            "Generate a complete, self-contained Python lesson on: {topic}\n\n"
+            "Domain: {domain_name}\n\n"
+            "OUTPUT RULES:\n"
+            "1. Return ONLY valid Python source code\n"
+            "2. Do NOT wrap the output in markdown code fences "
+            "(no ``` or ```python)\n"
+            "3. The first line must be a Python docstring or comment"
         ),
-    ],
-)
+    ),
+]
 
 
-FIX_LESSON_PROMPT = ChatPromptTemplate.from_messages(
-    [
+_FIX_MESSAGES: list[tuple[str, str]] = [
+    (
+        "system",
         (
-            "system",
-            (
-                "You are fixing a Python lesson that failed validation.\n\n"
-                "CONVENTIONS (same as original):\n"
-                "- `from __future__ import annotations` at the top\n"
-                "- Namespace imports for stdlib\n"
-                "- NumPy-style docstrings\n"
-                "- Type hints (mypy --strict compatible)\n"
-                "- Doctests must pass under `pytest --doctest-modules`\n"
-            ),
+            "You are fixing a Python lesson that failed validation.\n\n"
+            "CONVENTIONS (same as original):\n"
+            "- `from __future__ import annotations` at the top\n"
+            "- Namespace imports for stdlib\n"
+            "- NumPy-style docstrings\n"
+            "- Type hints (mypy --strict compatible)\n"
+            "- Doctests must pass under `pytest --doctest-modules`\n"
         ),
+    ),
+    (
+        "human",
         (
-            "human",
-            (
-                "The following code failed validation:\n\n"
-                "`````python\n{code}\n`````\n\n"
-                "Errors:\n{errors}\n\n"
-                "OUTPUT RULES:\n"
-                "1. Return ONLY valid Python source code\n"
-                "2. Do NOT wrap the output in markdown code fences "
-                "(no ``` or ```python)\n"
-                "3. The first line must be a Python docstring or comment"
-            ),
+            "The following code failed validation:\n\n"
+            "`````python\n{code}\n`````\n\n"
+            "Errors:\n{errors}\n\n"
+            "OUTPUT RULES:\n"
+            "1. Return ONLY valid Python source code\n"
+            "2. Do NOT wrap the output in markdown code fences "
+            "(no ``` or ```python)\n"
+            "3. The first line must be a Python docstring or comment"
         ),
-    ],
-)
+    ),
+]
+
+
+@functools.cache
+def get_generate_prompt() -> ChatPromptTemplate:
+    """Return the prompt for generating a new lesson.
+
+    Returns
+    -------
+    ChatPromptTemplate
+        Prompt expecting ``template``, ``existing_lessons``, ``number``,
+        ``filename``, ``topic``, and ``domain_name``.
+    """
+    from langchain_core.prompts import ChatPromptTemplate
+
+    return ChatPromptTemplate.from_messages(_GENERATE_MESSAGES)
+
+
+@functools.cache
+def get_fix_prompt() -> ChatPromptTemplate:
+    """Return the prompt for fixing a lesson that failed validation.
+
+    Returns
+    -------
+    ChatPromptTemplate
+        Prompt expecting ``code`` and ``errors``.
+    """
+    from langchain_core.prompts import ChatPromptTemplate
+
+    return ChatPromptTemplate.from_messages(_FIX_MESSAGES)
+
+
+_LAZY_PROMPTS: dict[str, t.Callable[[], ChatPromptTemplate]] = {
+    "GENERATE_LESSON_PROMPT": get_generate_prompt,
+    "FIX_LESSON_PROMPT": get_fix_prompt,
+}
+
+
+def __getattr__(name: str) -> t.Any:
+    """Build the prompt behind a legacy constant name on first access."""
+    if name in _LAZY_PROMPTS:
+        return _LAZY_PROMPTS[name]()
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
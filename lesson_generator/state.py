@@ -1,48 +1,22 @@
-"""LangGraph state definition for the lesson generation pipeline."""
+"""LangGraph state definition for the lesson generation pipeline.
+
+Pure ``typing``, so the graph module can import the state type without
+importing Pydantic.  The Pydantic input schema shown in LangGraph Studio
+is :class:`~lesson_generator.models.LessonGeneratorInput`; it is still
+importable from here, resolved on first access.
+"""
 
 from __future__ import annotations
 
 import typing as t
 
-from pydantic import BaseModel, Field
-
-#: Valid domain identifiers — must match keys in ``domains._REGISTRY``.
-DomainName = t.Literal["dsa", "asyncio"]
-
-
-class LessonGeneratorInput(BaseModel):
-    """Input schema for the lesson generation graph.
+if t.TYPE_CHECKING:
+    from lesson_generator.models import LessonGeneratorInput
 
-    Defines the fields that callers (CLI, Studio UI) must or may provide
-    when invoking the graph.  Uses Pydantic ``BaseModel`` so that
-    LangGraph Studio renders descriptions and enum dropdowns.
-    """
+__all__ = ("DomainName", "LessonGeneratorInput", "LessonGeneratorState")
 
-    topic: str = Field(
-        description="Lesson topic, e.g. 'hash tables'",
-    )
-    domain_name: DomainName = Field(
-        description="Learning domain to generate a lesson for",
-    )
-    target_dir: str | None = Field(
-        default=None,
-        description=(
-            "Output directory"
-            " (defaults to temp dir: {tempdir}/lesson-generator/{user}/{domain}/)"
-        ),
-    )
-    max_iterations: int = Field(
-        default=3,
-        description="Max generation/fix retry attempts",
-    )
-    dry_run: bool = Field(
-        default=False,
-        description="Validate only, don't write to disk",
-    )
-    force: bool = Field(
-        default=False,
-        description="Overwrite existing lesson files",
-    )
+#: Valid domain identifiers — must match keys in ``domains._DOMAIN_SPECS``.
+DomainName = t.Literal["dsa", "asyncio"]
 
 
 class LessonGeneratorState(t.TypedDict, total=False):
@@ -57,14 +31,22 @@ class LessonGeneratorState(t.TypedDict, total=False):
     target_dir : str
         Directory where the generated lesson will be written (string for
         JSON serialization safety).
+    resolved_target_dir : str
+        Absolute, symlink-resolved output directory, computed once by
+        ``load_context`` and reused by later nodes.
     template_content : str
         Content of the lesson template for this domain.
     existing_lessons : list[str]
         Filenames of existing lessons in the target directory.
     rendered_code : str
-        The generated Python lesson code.
-    metadata_json : str
-        JSON-serialized :class:`~lesson_generator.models.LessonMetadata`.
+        The generated Python lesson code.  Kept inline rather than as a
+        temp-file path: LangGraph passes the same ``str`` object between
+        nodes without copying it, Studio can display it, and ``--dry-run``
+        prints it from the final state.
+    metadata : dict[str, Any]
+        Lesson ``number``, ``title``, and ``filename``; the same fields as
+        :class:`~lesson_generator.models.LessonMetadata`, kept as a plain
+        dict so nodes skip Pydantic validation and JSON round-trips.
     validation_ok : bool
         Whether the generated code passed all validation checks.
     validation_errors : list[str]
@@ -87,10 +69,11 @@ class LessonGeneratorState(t.TypedDict, total=False):
     topic: str
     domain_name: str
     target_dir: str
+    resolved_target_dir: str
     template_content: str
     existing_lessons: list[str]
     rendered_code: str
-    metadata_json: str
+    metadata: dict[str, t.Any]
     validation_ok: bool
     validation_errors: list[str]
     iteration: int
@@ -99,3 +82,14 @@ class LessonGeneratorState(t.TypedDict, total=False):
     force: bool
     output_path: str
     status: str
+
+
+def __getattr__(name: str) -> t.Any:
+    """Resolve ``LessonGeneratorInput`` from its new home on first access."""
+    if name == "LessonGeneratorInput":
+        from lesson_generator.models import LessonGeneratorInput
+
+        globals()[name] = LessonGeneratorInput
+        return LessonGeneratorInput
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import functools
 import importlib.resources
 
 from lesson_generator.models import PedagogyStyle
@@ -13,9 +14,13 @@ _TEMPLATE_MAP: dict[PedagogyStyle, str] = {
 }
 
 
+@functools.cache
 def get_builtin_template(style: PedagogyStyle) -> str:
     """Load a built-in template for the given pedagogy style.
 
+    Templates ship with the package and never change at runtime, so each
+    one is read once per process.
+
     Parameters
     ----------
     style : PedagogyStyle
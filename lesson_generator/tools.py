@@ -2,22 +2,61 @@
 
 from __future__ import annotations
 
+import ast
+import atexit
+import collections
+import concurrent.futures
+import functools
 import getpass
+import hashlib
+import os
 import pathlib
 import re
+import shutil
+import stat
 import subprocess
 import sys
 import tempfile
+import threading
+import time
+import typing as t
+import uuid
 
 from lesson_generator.models import DomainConfig, ValidationResult
 from lesson_generator.templates import get_builtin_template
 
+#: Characters of the leading lesson number in a filename such as
+#: ``003_topic.py``.
+_ASCII_DIGITS = "0123456789"
+
+
+@functools.lru_cache(maxsize=32)
+def _read_template_file(path: str, mtime_ns: int) -> str:
+    """Read a template file, memoized on its path and modification time.
+
+    Parameters
+    ----------
+    path : str
+        Template file path.
+    mtime_ns : int
+        ``st_mtime_ns`` of *path*; part of the cache key so edits to the
+        template are picked up.
+
+    Returns
+    -------
+    str
+        Template content.
+    """
+    return pathlib.Path(path).read_text(encoding="utf-8")
+
 
 def read_template(config: DomainConfig) -> str:
     """Read the lesson template for a domain.
 
     Tries the project-specific template first, falls back to
-    the built-in template for the domain's pedagogy style.
+    the built-in template for the domain's pedagogy style.  Project
+    templates are cached per process until the file's mtime changes, so
+    batch runs read each template once.
 
     Parameters
     ----------
@@ -31,11 +70,28 @@ def read_template(config: DomainConfig) -> str:
     """
     if config.project_path and config.template_path:
         template_file = config.project_path / config.template_path
-        if template_file.is_file():
-            return template_file.read_text(encoding="utf-8")
+        try:
+            st = template_file.stat()
+        except OSError:
+            pass
+        else:
+            if stat.S_ISREG(st.st_mode):
+                return _read_template_file(str(template_file), st.st_mtime_ns)
     return get_builtin_template(config.pedagogy)
 
 
+def _lesson_root(
+    config: DomainConfig,
+    target_dir: pathlib.Path | None,
+) -> pathlib.Path | None:
+    """Return the directory to scan for lessons, or ``None`` if there is none."""
+    if target_dir is not None:
+        return target_dir
+    if config.project_path is not None:
+        return config.project_path / config.lesson_dir
+    return None
+
+
 def list_existing_lessons(
     config: DomainConfig,
     *,
@@ -57,21 +113,51 @@ def list_existing_lessons(
         Sorted list of ``.py`` filenames (excluding ``__init__.py``
         and ``__pycache__``).
     """
-    if target_dir is not None:
-        lesson_dir = target_dir
-    elif config.project_path is not None:
-        lesson_dir = config.project_path / config.lesson_dir
-    else:
+    root = _lesson_root(config, target_dir)
+    if root is None:
         return []
-    if not lesson_dir.is_dir():
-        return []
-    files: list[str] = []
-    for p in sorted(lesson_dir.rglob("*.py")):
-        if p.name.startswith("__"):
+    # Sorting on the component tuples gives the same order as sorting
+    # ``pathlib`` paths, without building a path object per file.
+    return [prefix + parts[-1] for parts, prefix in sorted(_iter_lesson_files(root))]
+
+
+def _iter_lesson_files(
+    root: pathlib.Path,
+) -> t.Iterator[tuple[tuple[str, ...], str]]:
+    """Recursively yield lesson ``.py`` files under *root*, unordered.
+
+    Uses ``os.scandir`` so names are filtered on the cached directory
+    entry before any path object is built, and ``__pycache__`` is never
+    descended into.  A missing or unreadable *root* yields nothing.
+
+    Parameters
+    ----------
+    root : pathlib.Path
+        Directory to scan.
+
+    Yields
+    ------
+    tuple[tuple[str, ...], str]
+        Path components of each lesson file relative to *root*, and the
+        ``os.sep``-joined prefix of its parent directory (``""`` at the
+        top level).
+    """
+    stack: list[tuple[tuple[str, ...], str, str]] = [((), "", os.fspath(root))]
+    while stack:
+        parts, prefix, directory = stack.pop()
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
             continue
-        # Store path relative to lesson_dir
-        files.append(str(p.relative_to(lesson_dir)))
-    return files
+        for entry in entries:
+            name = entry.name
+            if entry.is_dir(follow_symlinks=False):
+                if name != "__pycache__":
+                    stack.append(
+                        ((*parts, name), f"{prefix}{name}{os.sep}", entry.path),
+                    )
+            elif name.endswith(".py") and not name.startswith("__") and entry.is_file():
+                yield (*parts, name), prefix
 
 
 def next_lesson_number(
@@ -83,6 +169,8 @@ def next_lesson_number(
 
     Scans filenames for a leading numeric prefix (e.g. ``003_topic.py``)
     and returns ``max + 1``. Returns ``1`` if no numbered lessons exist.
+    The lesson tree is walked once, keeping a running maximum, without
+    building or sorting the full listing.
 
     Parameters
     ----------
@@ -96,14 +184,17 @@ def next_lesson_number(
     int
         Next available lesson number.
     """
-    pattern = re.compile(r"^(\d+)")
+    root = _lesson_root(config, target_dir)
+    if root is None:
+        return 1
     max_num = 0
-    for filename in list_existing_lessons(config, target_dir=target_dir):
-        # Use only the basename for matching
-        basename = pathlib.PurePosixPath(filename).name
-        m = pattern.match(basename)
-        if m:
-            max_num = max(max_num, int(m.group(1)))
+    for parts, _ in _iter_lesson_files(root):
+        # Use only the basename; its leading digit run is the number,
+        # however many digits it has.
+        name = parts[-1]
+        digits = len(name) - len(name.lstrip(_ASCII_DIGITS))
+        if digits:
+            max_num = max(max_num, int(name[:digits]))
     return max_num + 1
 
 
@@ -170,15 +261,332 @@ def merged_next_lesson_number(
     return max(project_next, output_next)
 
 
+class _ToolRun(t.NamedTuple):
+    """Outcome of one validation tool subprocess."""
+
+    name: str
+    returncode: int | None
+    """Exit status, or ``None`` if the tool timed out."""
+    stdout: bytes
+    stderr: bytes
+
+
+#: Command prefixes for the validation tools; the file path is appended.
+#: ruff's and mypy's prefixes come from :func:`_ruff_argv` and
+#: :func:`_mypy_argv`.
+_PYTEST_ARGV = (
+    sys.executable,
+    "-m",
+    "pytest",
+    "--doctest-modules",
+    "-p",
+    "no:cacheprovider",
+)
+_PYTEST_ELLIPSIS_ARGV = (
+    *_PYTEST_ARGV,
+    "-o",
+    "doctest_optionflags=ELLIPSIS NORMALIZE_WHITESPACE",
+)
+
+#: Set for the pytest run only.  Doctest collection is built into pytest, and
+#: importing the installed third-party plugins (langsmith, anyio, asyncio)
+#: took most of its start-up time.
+_PYTEST_ENV_OVERRIDES = {"PYTEST_DISABLE_PLUGIN_AUTOLOAD": "1"}
+
+#: Matches a doctest prompt at the start of a line.  Lessons without one
+#: skip the pytest run, which would collect nothing and exit with 5.
+_DOCTEST_PROMPT_RE = re.compile(r"^[^\S\n]*>>>", re.MULTILINE)
+
+#: Imports the lesson the way pytest's collection would (``__name__`` is
+#: not ``"__main__"``), for lessons whose pytest run is skipped, so errors
+#: raised at module level are still reported.
+_IMPORT_ARGV = (
+    sys.executable,
+    "-c",
+    "import runpy, sys; runpy.run_path(sys.argv[1])",
+)
+
+#: ``tools_run`` entry recorded when pytest is skipped for lack of doctests.
+_PYTEST_SKIPPED_NO_DOCTESTS = "pytest (skipped: no doctests)"
+
+#: Seconds one validation may spend in its tools, mypy daemon start
+#: included, before the stragglers are killed.
+_TOOL_TIMEOUT = 120
+
+#: Exit codes that count as success, per tool.  pytest exits with 5 when
+#: no tests were collected, which is not a failure for a lesson.
+_OK_RETURNCODES: dict[str, tuple[int, ...]] = {"pytest": (0, 5)}
+
+
+@functools.cache
+def _ruff_argv() -> tuple[str, ...]:
+    """Return the command prefix that runs ruff.
+
+    Prefers the native binary shipped in the ``ruff`` package, which
+    skips the Python interpreter start that ``python -m ruff`` pays just
+    to locate and exec that same binary.
+
+    Returns
+    -------
+    tuple[str, ...]
+        ``(ruff_bin,)``, or ``(python, "-m", "ruff")`` when the binary
+        cannot be located.
+    """
+    try:
+        from ruff import find_ruff_bin
+    except ImportError:
+        return (sys.executable, "-m", "ruff")
+    try:
+        return (str(find_ruff_bin()),)
+    except FileNotFoundError:
+        return (sys.executable, "-m", "ruff")
+
+
+#: Serializes daemon startup across concurrent validations.
+_DMYPY_LOCK = threading.Lock()
+
+#: Status files of running mypy daemons, keyed on their flags.  Only
+#: successful starts are recorded, so a failed start is retried by the
+#: next validation.
+_DMYPY_STATUS_FILES: dict[tuple[str, ...], str] = {}
+
+
+def _start_dmypy(flags: tuple[str, ...], *, deadline: float) -> str | None:
+    """Start a mypy daemon for *flags* and return its status file.
+
+    One daemon runs per flag set, so strict and non-strict domains each
+    keep a warm cache instead of restarting a shared daemon.  The daemon
+    is stopped at interpreter exit.  ``dmypy restart`` is used so that a
+    daemon left behind by an earlier, timed-out start is replaced.
+
+    Parameters
+    ----------
+    flags : tuple[str, ...]
+        mypy options the daemon is started with.
+    deadline : float
+        :func:`time.monotonic` value by which the start must finish.
+
+    Returns
+    -------
+    str | None
+        Path to the daemon's status file, or ``None`` if it could not be
+        started in time.
+    """
+    suffix = "".join(f"-{flag.lstrip('-')}" for flag in flags)
+    status_file = str(_validation_dir() / f"dmypy{suffix}.json")
+    dmypy = (sys.executable, "-m", "mypy.dmypy", "--status-file", status_file)
+    try:
+        proc = subprocess.run(
+            [*dmypy, "restart", "--", *flags],
+            capture_output=True,
+            timeout=max(deadline - time.monotonic(), 0),
+            check=False,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    if proc.returncode != 0:
+        return None
+    atexit.register(
+        subprocess.run,
+        [*dmypy, "stop"],
+        capture_output=True,
+        check=False,
+    )
+    return status_file
+
+
+def _mypy_argv(*, strict: bool, deadline: float) -> tuple[str, ...]:
+    """Return the command prefix that type-checks a file with mypy.
+
+    Routes through ``dmypy run`` so stdlib and typeshed analysis stays
+    warm across validations; falls back to a cold ``python -m mypy``
+    when the daemon cannot be started before *deadline*.  Waiting on
+    another validation's start also counts against *deadline*.
+
+    Parameters
+    ----------
+    strict : bool
+        Whether to pass ``--strict``.
+    deadline : float
+        :func:`time.monotonic` value shared with the other tools.
+
+    Returns
+    -------
+    tuple[str, ...]
+        Command prefix; the file to check is appended.
+    """
+    flags = ("--strict",) if strict else ()
+    status_file = _DMYPY_STATUS_FILES.get(flags)
+    if status_file is None and _DMYPY_LOCK.acquire(
+        timeout=max(deadline - time.monotonic(), 0),
+    ):
+        try:
+            status_file = _DMYPY_STATUS_FILES.get(flags)
+            if status_file is None:
+                status_file = _start_dmypy(flags, deadline=deadline)
+                if status_file is not None:
+                    _DMYPY_STATUS_FILES[flags] = status_file
+        finally:
+            _DMYPY_LOCK.release()
+    if status_file is None:
+        return (sys.executable, "-m", "mypy", *flags)
+    return (
+        sys.executable,
+        "-m",
+        "mypy.dmypy",
+        "--status-file",
+        status_file,
+        "run",
+        "--",
+        *flags,
+    )
+
+
+@functools.cache
+def _validation_dir() -> pathlib.Path:
+    """Return the per-process scratch directory for validation files.
+
+    Created on first use and removed at interpreter exit, so repeated
+    validations (one per retry) skip creating and deleting a directory.
+
+    Returns
+    -------
+    pathlib.Path
+        Directory holding one uniquely named file per validation.
+    """
+    path = pathlib.Path(tempfile.mkdtemp(prefix="lessongen-"))
+    atexit.register(shutil.rmtree, path, ignore_errors=True)
+    return path
+
+
+@functools.cache
+def _validation_pool() -> concurrent.futures.ThreadPoolExecutor:
+    """Return the thread pool that runs the concurrent validation tools.
+
+    Shared by every validation in the process, so the fix/validate retry
+    loop reuses the same worker threads instead of starting new ones
+    each iteration.
+
+    Returns
+    -------
+    concurrent.futures.ThreadPoolExecutor
+        Pool sized for ruff, mypy, and pytest running side by side.
+    """
+    pool = concurrent.futures.ThreadPoolExecutor(
+        max_workers=3,
+        thread_name_prefix="lessongen-val",
+    )
+    atexit.register(pool.shutdown, wait=False)
+    return pool
+
+
+def _syntax_error(code: str) -> str | None:
+    """Return the syntax error message for *code*, or ``None`` if it parses.
+
+    Not memoized: it only runs on a :data:`_VALIDATION_CACHE` miss, so
+    repeated source is answered before it gets here.  Parsing alone skips
+    bytecode generation; the few errors only the compiler raises (e.g.
+    ``return`` outside a function) are still reported by ruff and mypy.
+
+    Parameters
+    ----------
+    code : str
+        Python source code.
+
+    Returns
+    -------
+    str | None
+        ``"Syntax error: ..."`` message, or ``None``.
+    """
+    try:
+        ast.parse(code, filename="lesson.py")
+    except SyntaxError as exc:
+        return f"Syntax error: {exc}"
+    return None
+
+
+def _run_tool(
+    name: str,
+    argv: list[str],
+    stdin: bytes | None = None,
+    env: dict[str, str] | None = None,
+    *,
+    deadline: float,
+) -> _ToolRun:
+    """Run a validation tool to completion, killing it at *deadline*.
+
+    Output is kept as raw bytes; only failing runs are decoded, by the
+    caller.
+
+    Parameters
+    ----------
+    name : str
+        Tool label used in ``tools_run`` and error messages.
+    argv : list[str]
+        Command line to execute.
+    stdin : bytes | None
+        Data piped to the tool's standard input, if any.
+    env : dict[str, str] | None
+        Environment for the tool; ``None`` inherits this process's.
+    deadline : float
+        :func:`time.monotonic` value by which the tool must finish.
+
+    Returns
+    -------
+    _ToolRun
+        Captured exit status and output.
+    """
+    try:
+        proc = subprocess.run(
+            argv,
+            input=stdin,
+            env=env,
+            capture_output=True,
+            timeout=max(deadline - time.monotonic(), 0),
+            check=False,
+        )
+    except subprocess.TimeoutExpired:
+        return _ToolRun(name, None, b"", b"")
+    return _ToolRun(name, proc.returncode, proc.stdout, proc.stderr)
+
+
+#: Memoized validation results, keyed on ``(blake2b(code), strict_mypy,
+#: doctest_strategy)`` and evicted least-recently-used first.
+_VALIDATION_CACHE: collections.OrderedDict[
+    tuple[bytes, bool, str],
+    ValidationResult,
+] = collections.OrderedDict()
+_VALIDATION_CACHE_SIZE = 64
+_VALIDATION_CACHE_LOCK = threading.Lock()
+
+
 def validate_in_temp(code: str, config: DomainConfig) -> ValidationResult:
     """Validate generated code in a temporary directory.
 
     Runs the full quality pipeline: syntax check, ``ruff format``
     (normalization), ``ruff check``, ``mypy``, and ``pytest
-    --doctest-modules``.  Normalized code (after ``ruff format``) is
+    --doctest-modules``.  Code without a ``>>>`` prompt skips pytest and
+    is only imported in a plain interpreter, which still catches errors
+    raised at module level; ``tools_run`` then records ``"import"`` and
+    ``"pytest (skipped: no doctests)"``.  Normalized code (after ``ruff format``) is
     returned in :attr:`ValidationResult.normalized_code` when formatting
     changed the input.
 
+    The syntax check and ``ruff format`` run first and in order.
+    ``ruff format`` reads the code on stdin and returns the formatted
+    source on stdout, which is then written to the temp file once.  The
+    remaining checks only read that file, so they run concurrently and
+    the wall time is that of the slowest tool rather than their sum.
+
+    All tools share one time budget of ``_TOOL_TIMEOUT`` seconds,
+    counted from the start of the call; any tool still running when it
+    is spent is killed and reported as timed out.
+
+    Results are memoized per process on a hash of *code* plus the
+    config fields that affect validation, so code that comes back
+    unchanged from a fix attempt is not re-checked.  Runs in which a
+    tool timed out are not memoized.
+
     Parameters
     ----------
     code : str
@@ -193,147 +601,167 @@ def validate_in_temp(code: str, config: DomainConfig) -> ValidationResult:
         Validation outcome with errors, tools run, and optionally
         normalized code.
     """
+    key = (
+        hashlib.blake2b(code.encode("utf-8"), digest_size=16).digest(),
+        config.strict_mypy,
+        config.doctest_strategy,
+    )
+    with _VALIDATION_CACHE_LOCK:
+        cached = _VALIDATION_CACHE.get(key)
+        if cached is not None:
+            _VALIDATION_CACHE.move_to_end(key)
+            return cached.model_copy(deep=True)
+
+    result, timed_out = _validate_uncached(code, config)
+    if not timed_out:
+        with _VALIDATION_CACHE_LOCK:
+            _VALIDATION_CACHE[key] = result.model_copy(deep=True)
+            if len(_VALIDATION_CACHE) > _VALIDATION_CACHE_SIZE:
+                _VALIDATION_CACHE.popitem(last=False)
+    return result
+
+
+def _validate_uncached(
+    code: str,
+    config: DomainConfig,
+) -> tuple[ValidationResult, bool]:
+    """Run the validation pipeline for :func:`validate_in_temp`.
+
+    Returns
+    -------
+    tuple[ValidationResult, bool]
+        The outcome, and whether any tool timed out.
+    """
     errors: list[str] = []
     tools_run: list[str] = []
     normalized_code: str | None = None
 
-    with tempfile.TemporaryDirectory() as tmpdir:
-        tmp_path = pathlib.Path(tmpdir) / "lesson.py"
-        tmp_path.write_text(code, encoding="utf-8")
-
-        # --- Syntax check via compile ---
-        try:
-            compile(code, str(tmp_path), "exec")
-        except SyntaxError as exc:
-            return ValidationResult(
-                is_valid=False,
-                errors=[f"Syntax error: {exc}"],
-                tools_run=["compile"],
-            )
-        tools_run.append("compile")
-
-        # --- ruff format (normalization) ---
-        try:
-            subprocess.run(
-                [sys.executable, "-m", "ruff", "format", str(tmp_path)],
-                capture_output=True,
-                text=True,
-                timeout=120,
-                check=False,
-            )
-        except subprocess.TimeoutExpired:
-            return ValidationResult(
-                is_valid=False,
-                errors=["ruff format: timed out after 120s"],
-                tools_run=[*tools_run, "ruff_format"],
-            )
-        tools_run.append("ruff_format")
-        formatted = tmp_path.read_text(encoding="utf-8")
-        if formatted != code:
-            normalized_code = formatted
-
-        # --- ruff check ---
-        try:
-            ruff_result = subprocess.run(
-                [sys.executable, "-m", "ruff", "check", str(tmp_path)],
-                capture_output=True,
-                text=True,
-                timeout=120,
-                check=False,
-            )
-        except subprocess.TimeoutExpired:
-            return ValidationResult(
-                is_valid=False,
-                errors=["ruff: timed out after 120s"],
-                tools_run=[*tools_run, "ruff"],
-                normalized_code=normalized_code,
-            )
-        tools_run.append("ruff")
-        if ruff_result.returncode != 0:
-            msg = ruff_result.stdout.strip()
-            if ruff_result.stderr.strip():
-                msg = f"{msg}\nstderr: {ruff_result.stderr.strip()}"
-            errors.append(f"ruff: {msg}")
-
-        # --- mypy ---
-        if config.strict_mypy:
-            mypy_args = [
-                sys.executable,
-                "-m",
-                "mypy",
-                "--strict",
-                str(tmp_path),
-            ]
-        else:
-            mypy_args = [sys.executable, "-m", "mypy", str(tmp_path)]
-
-        try:
-            mypy_result = subprocess.run(
-                mypy_args,
-                capture_output=True,
-                text=True,
-                timeout=120,
-                check=False,
-            )
-        except subprocess.TimeoutExpired:
-            return ValidationResult(
-                is_valid=False,
-                errors=[*errors, "mypy: timed out after 120s"],
-                tools_run=[*tools_run, "mypy"],
-                normalized_code=normalized_code,
+    # --- Syntax check via ast.parse (reported as "compile") ---
+    syntax_error = _syntax_error(code)
+    if syntax_error is not None:
+        return ValidationResult(
+            is_valid=False,
+            errors=[syntax_error],
+            tools_run=["compile"],
+        ), False
+    tools_run.append("compile")
+
+    deadline = time.monotonic() + _TOOL_TIMEOUT
+    tmp_path = _validation_dir() / f"lesson_{os.getpid()}_{uuid.uuid4().hex}.py"
+    target = str(tmp_path)
+
+    # --- ruff format (normalization) ---
+    # ``--stdin-filename`` points at the temp path so ruff resolves the
+    # same configuration it would for the file itself.
+    fmt = _run_tool(
+        "ruff_format",
+        [*_ruff_argv(), "format", "--stdin-filename", target],
+        stdin=code.encode("utf-8"),
+        deadline=deadline,
+    )
+    tools_run.append(fmt.name)
+    if fmt.returncode is None:
+        return ValidationResult(
+            is_valid=False,
+            errors=[f"ruff format: timed out after {_TOOL_TIMEOUT}s"],
+            tools_run=tools_run,
+        ), True
+    # A failed format leaves the code as-is; ruff check reports why.
+    formatted = fmt.stdout.decode("utf-8") if fmt.returncode == 0 else code
+    if formatted != code:
+        normalized_code = formatted
+
+    tmp_path.write_text(formatted, encoding="utf-8")
+    try:
+        # --- ruff check, mypy, pytest --doctest-modules or import ---
+        mypy_argv = _mypy_argv(strict=config.strict_mypy, deadline=deadline)
+        # ruff check reads the source on stdin; only mypy and pytest (or
+        # the import) need the file on disk.
+        checks: list[tuple[str, list[str], bytes | None, dict[str, str] | None]] = [
+            (
+                "ruff",
+                [*_ruff_argv(), "check", "--stdin-filename", target],
+                formatted.encode("utf-8"),
+                None,
+            ),
+            ("mypy", [*mypy_argv, target], None, None),
+        ]
+        run_doctests = config.doctest_strategy != "skip"
+        pytest_skipped = run_doctests and not _DOCTEST_PROMPT_RE.search(code)
+        if pytest_skipped:
+            checks.append(("import", [*_IMPORT_ARGV, target], None, None))
+        elif run_doctests:
+            pytest_argv = (
+                _PYTEST_ELLIPSIS_ARGV
+                if config.doctest_strategy == "ellipsis"
+                else _PYTEST_ARGV
             )
-        tools_run.append("mypy")
-        if mypy_result.returncode != 0:
-            msg = mypy_result.stdout.strip()
-            if mypy_result.stderr.strip():
-                msg = f"{msg}\nstderr: {mypy_result.stderr.strip()}"
-            errors.append(f"mypy: {msg}")
-
-        # --- pytest --doctest-modules ---
-        if config.doctest_strategy != "skip":
-            pytest_args = [
-                sys.executable,
-                "-m",
-                "pytest",
-                "--doctest-modules",
-                str(tmp_path),
-            ]
-            if config.doctest_strategy == "ellipsis":
-                pytest_args.extend(
-                    [
-                        "-o",
-                        "doctest_optionflags=ELLIPSIS NORMALIZE_WHITESPACE",
-                    ]
-                )
-            try:
-                pytest_result = subprocess.run(
-                    pytest_args,
-                    capture_output=True,
-                    text=True,
-                    timeout=120,
-                    check=False,
-                )
-            except subprocess.TimeoutExpired:
-                return ValidationResult(
-                    is_valid=False,
-                    errors=[*errors, "pytest: timed out after 120s"],
-                    tools_run=[*tools_run, "pytest"],
-                    normalized_code=normalized_code,
-                )
-            tools_run.append("pytest")
-            # Exit code 5 means "no tests collected" — not a failure.
-            if pytest_result.returncode not in (0, 5):
-                msg = pytest_result.stdout.strip()
-                if pytest_result.stderr.strip():
-                    msg = f"{msg}\nstderr: {pytest_result.stderr.strip()}"
-                errors.append(f"pytest: {msg}")
+            pytest_env = {**os.environ, **_PYTEST_ENV_OVERRIDES}
+            checks.append(("pytest", [*pytest_argv, target], None, pytest_env))
+
+        runs = list(
+            _validation_pool().map(
+                lambda check: _run_tool(*check, deadline=deadline),
+                checks,
+            ),
+        )
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+    # Aggregate in submission order so error output is deterministic.
+    timed_out = False
+    for run in runs:
+        tools_run.append(run.name)
+        if run.returncode is None:
+            timed_out = True
+            errors.append(f"{run.name}: timed out after {_TOOL_TIMEOUT}s")
+            continue
+        if run.returncode not in _OK_RETURNCODES.get(run.name, (0,)):
+            msg = run.stdout.decode("utf-8", errors="replace").strip()
+            stderr = run.stderr.decode("utf-8", errors="replace").strip()
+            if stderr:
+                msg = f"{msg}\nstderr: {stderr}"
+            errors.append(f"{run.name}: {msg}")
+    if pytest_skipped:
+        tools_run.append(_PYTEST_SKIPPED_NO_DOCTESTS)
 
     return ValidationResult(
         is_valid=len(errors) == 0,
         errors=errors,
         tools_run=tools_run,
         normalized_code=normalized_code,
-    )
+    ), timed_out
+
+
+def _create_exclusive(path: pathlib.Path) -> int:
+    """Create *path* for writing, failing if it exists.
+
+    The open is tried before creating parent directories: the output
+    directory usually exists already, so the ``mkdir`` walk only runs
+    when the open reports it missing.
+
+    Parameters
+    ----------
+    path : pathlib.Path
+        File to create.
+
+    Returns
+    -------
+    int
+        Open file descriptor.
+
+    Raises
+    ------
+    FileExistsError
+        If *path* already exists.
+    """
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL
+    # 0o666 filtered by the umask, as ``Path.write_text`` would create it.
+    try:
+        return os.open(path, flags, 0o666)
+    except FileNotFoundError:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return os.open(path, flags, 0o666)
 
 
 def write_lesson(
@@ -344,7 +772,15 @@ def write_lesson(
 ) -> None:
     """Write lesson content to disk with overwrite protection.
 
-    Creates parent directories as needed.
+    Creates parent directories as needed.  Without *force* the file is
+    created with ``O_EXCL``, so the existence check and the create are one
+    atomic step.  With *force* the content goes to a sibling temp file
+    that is renamed over *path*, so readers never see a partial lesson.
+    A symlinked *path* is written through to its target, and an
+    overwritten lesson keeps its permission bits.  No containment check
+    is made here: callers writing into a lesson root must resolve *path*
+    and check it first, as :func:`~lesson_generator.nodes.write_output`
+    does.
 
     Parameters
     ----------
@@ -360,8 +796,34 @@ def write_lesson(
     FileExistsError
         If the file exists and ``force`` is ``False``.
     """
-    if path.exists() and not force:
-        msg = f"File already exists: {path}. Use --force to overwrite."
-        raise FileExistsError(msg)
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(content, encoding="utf-8")
+    data = content.encode("utf-8")
+    if not force:
+        try:
+            fd = _create_exclusive(path)
+        except FileExistsError:
+            msg = f"File already exists: {path}. Use --force to overwrite."
+            raise FileExistsError(msg) from None
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+        except BaseException:
+            path.unlink(missing_ok=True)
+            raise
+        return
+
+    dest = path.resolve()
+    tmp = dest.with_name(f".{dest.name}.{uuid.uuid4().hex}.tmp")
+    fd = _create_exclusive(tmp)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        try:
+            mode = stat.S_IMODE(dest.stat().st_mode)
+        except FileNotFoundError:
+            pass
+        else:
+            tmp.chmod(mode)
+        tmp.replace(dest)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
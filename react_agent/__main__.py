@@ -27,4 +27,5 @@ def main() -> None:
             print(f"{message.type}: {message.content}")
 
 
-main()
+if __name__ == "__main__":
+    main()
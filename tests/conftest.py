@@ -2,15 +2,42 @@
 
 from __future__ import annotations
 
+import collections
 import os
 import pathlib
+import shutil
+from collections.abc import Iterator
 
 import pytest
 
+from lesson_generator import tools
 from lesson_generator.models import DomainConfig, PedagogyStyle, ProjectType
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session", autouse=True)
+def _no_bytecode_in_subprocesses() -> Iterator[None]:
+    """Stop validation subprocesses from writing ``__pycache__``.
+
+    ``PYTHONDONTWRITEBYTECODE`` is inherited by the doctest runs, so they
+    do not cache bytecode for throwaway lesson files.  The variable is
+    restored when the session ends.
+    """
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("PYTHONDONTWRITEBYTECODE", "1")
+        yield
+
+
+@pytest.fixture(autouse=True)
+def _fresh_validation_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Give every test an empty validation cache.
+
+    ``validate_in_temp`` memoizes per process, so without this whether a
+    test really runs the tools would depend on which tests ran before it.
+    """
+    monkeypatch.setattr(tools, "_VALIDATION_CACHE", collections.OrderedDict())
+
+
+@pytest.fixture(scope="session")
 def sample_template() -> str:
     """Return a minimal lesson template string."""
     return (
@@ -25,15 +52,19 @@ def sample_template() -> str:
     )
 
 
-@pytest.fixture()
-def mock_project_dir(tmp_path: pathlib.Path) -> pathlib.Path:
+@pytest.fixture(scope="session")
+def mock_project_dir(tmp_path_factory: pytest.TempPathFactory) -> pathlib.Path:
     """Create a minimal project directory with a lesson template.
 
+    Built once per session and shared, so tests must treat it as
+    read-only; use :func:`mock_project_dir_rw` to modify files.
+
     Returns
     -------
     pathlib.Path
         Root of the mock project.
     """
+    tmp_path = tmp_path_factory.mktemp("mock_project")
     notes = tmp_path / "notes"
     notes.mkdir()
     template = notes / "lesson_template.py"
@@ -63,9 +94,22 @@ def mock_project_dir(tmp_path: pathlib.Path) -> pathlib.Path:
 
 
 @pytest.fixture()
+def mock_project_dir_rw(
+    mock_project_dir: pathlib.Path,
+    tmp_path: pathlib.Path,
+) -> pathlib.Path:
+    """Return a private, writable copy of :func:`mock_project_dir`."""
+    return shutil.copytree(mock_project_dir, tmp_path / "project")
+
+
+@pytest.fixture(scope="session")
 def test_domain_config(mock_project_dir: pathlib.Path) -> DomainConfig:
-    """Return a DomainConfig pointing at the mock project."""
-    return DomainConfig(
+    """Return a DomainConfig pointing at the mock project.
+
+    Shared for the whole session like :func:`mock_project_dir`; tests that
+    need different settings should derive one with ``model_copy``.
+    """
+    return DomainConfig.model_construct(
         name="test",
         pedagogy=PedagogyStyle.CONCEPT_FIRST,
         project_type=ProjectType.LESSON_BASED,
@@ -76,7 +120,7 @@ def test_domain_config(mock_project_dir: pathlib.Path) -> DomainConfig:
     )
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def api_keys_available() -> bool:
-    """Check if real API keys are set."""
+    """Check if real API keys are set (read once per session)."""
     return bool(os.environ.get("ANTHROPIC_API_KEY"))
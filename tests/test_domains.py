@@ -3,14 +3,14 @@
 from __future__ import annotations
 
 import pathlib
-from collections.abc import Iterator
 
 import pytest
 
+from lesson_generator import domains
 from lesson_generator.domains import (
-    _REGISTRY,
     _register,
     get_domain,
+    list_domain_summaries,
     list_domains,
     validate_environment,
 )
@@ -18,18 +18,15 @@ from lesson_generator.models import DomainConfig, PedagogyStyle, ProjectType
 
 
 @pytest.fixture()
-def _clean_registry() -> Iterator[None]:
-    """Snapshot and restore the registry around each test."""
-    original = dict(_REGISTRY)
-    yield
-    _REGISTRY.clear()
-    _REGISTRY.update(original)
+def _clean_registry(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Give each test its own copy of the registry."""
+    monkeypatch.setattr(domains, "_REGISTRY", dict(domains._REGISTRY))
 
 
 @pytest.mark.usefixtures("_clean_registry")
 def test_get_domain_returns_registered() -> None:
     """get_domain should return a previously registered config."""
-    config = DomainConfig(
+    config = DomainConfig.model_construct(
         name="_test_reg",
         pedagogy=PedagogyStyle.CONCEPT_FIRST,
         project_type=ProjectType.LESSON_BASED,
@@ -50,7 +47,7 @@ def test_list_domains_returns_sorted() -> None:
     """list_domains should return domain names in sorted order."""
     for name in ("zzz", "aaa", "mmm"):
         _register(
-            DomainConfig(
+            DomainConfig.model_construct(
                 name=name,
                 pedagogy=PedagogyStyle.CONCEPT_FIRST,
                 project_type=ProjectType.LESSON_BASED,
@@ -61,6 +58,41 @@ def test_list_domains_returns_sorted() -> None:
     assert names == sorted(names)
 
 
+@pytest.mark.usefixtures("_clean_registry")
+def test_list_domain_summaries_matches_registry() -> None:
+    """list_domain_summaries should mirror registered configs as plain strings."""
+    _register(
+        DomainConfig.model_construct(
+            name="_test_summary",
+            pedagogy=PedagogyStyle.INTEGRATION_FIRST,
+            project_type=ProjectType.APP_BASED,
+        ),
+    )
+    summaries = list_domain_summaries()
+    assert [name for name, _, _ in summaries] == list_domains()
+    assert ("_test_summary", "integration_first", "app_based") in summaries
+
+
+@pytest.mark.usefixtures("_clean_registry")
+def test_builtin_domain_built_on_first_lookup() -> None:
+    """Built-in domains should be constructed lazily and then memoized."""
+    domains._REGISTRY.pop("dsa", None)
+    assert "dsa" in list_domains()
+    config = get_domain("dsa")
+    assert config.name == "dsa"
+    assert config.lesson_dir == "src/algorithms"
+    assert get_domain("dsa") is config
+
+
+@pytest.mark.usefixtures("_clean_registry")
+def test_get_domain_prefers_registered_override() -> None:
+    """_register should replace a memoized built-in on the next lookup."""
+    builtin = get_domain("dsa")
+    override = builtin.model_copy(update={"lesson_dir": "elsewhere"})
+    _register(override)
+    assert get_domain("dsa") is override
+
+
 def test_validate_environment_ok_when_path_exists(tmp_path: pathlib.Path) -> None:
     """validate_environment should pass when project_path exists."""
     config = DomainConfig(
@@ -2,18 +2,26 @@
 
 from __future__ import annotations
 
+import functools
 import pathlib
-from collections.abc import Iterator
+import typing as t
+from collections.abc import Callable
 
 import pytest
 from langchain_core.language_models.fake_chat_models import FakeListChatModel
 from langgraph.graph import END, START
 
+from lesson_generator import domains
 from lesson_generator.domains import _register
 from lesson_generator.graph import _build_graph
 from lesson_generator.models import DomainConfig, PedagogyStyle, ProjectType
 from lesson_generator.state import LessonGeneratorState
 
+if t.TYPE_CHECKING:
+    from langgraph.graph.state import CompiledStateGraph
+
+    GraphFactory = Callable[[tuple[str, ...]], CompiledStateGraph]  # type: ignore[type-arg]
+
 VALID_LESSON = '''"""Test lesson."""
 
 from __future__ import annotations
@@ -46,26 +54,97 @@ if __name__ == "__main__":
 '''
 
 
-@pytest.fixture()
-def _register_test_domain(tmp_path: pathlib.Path) -> Iterator[None]:
-    """Register a temporary test domain and clean up after."""
-    src = tmp_path / "src"
-    src.mkdir()
-    _register(
-        DomainConfig(
-            name="_test_graph",
-            pedagogy=PedagogyStyle.CONCEPT_FIRST,
-            project_type=ProjectType.LESSON_BASED,
-            project_path=tmp_path,
-            lesson_dir="src",
-            strict_mypy=False,
-        ),
+EXPECTED_NODES = frozenset(
+    {
+        "load_context",
+        "generate_lesson",
+        "validate_lesson",
+        "fix_lesson",
+        "write_output",
+        START,
+        END,
+    },
+)
+
+
+@pytest.fixture(scope="session")
+def graph_factory() -> GraphFactory:
+    """Return a factory that compiles one graph per distinct response list.
+
+    ``FakeListChatModel`` cycles through its responses, and every list
+    used here repeats a single response, so a compiled graph can be
+    shared by all tests that ask for the same responses.
+    """
+
+    @functools.cache
+    def make(responses: tuple[str, ...]) -> CompiledStateGraph:  # type: ignore[type-arg]
+        return _build_graph(FakeListChatModel(responses=list(responses)))
+
+    return make
+
+
+def _test_domain(project_path: pathlib.Path) -> DomainConfig:
+    """Return the ``_test_graph`` domain rooted at *project_path*."""
+    return DomainConfig.model_construct(
+        name="_test_graph",
+        pedagogy=PedagogyStyle.CONCEPT_FIRST,
+        project_type=ProjectType.LESSON_BASED,
+        project_path=project_path,
+        lesson_dir="src",
+        strict_mypy=False,
     )
-    yield
-    # Clean up registry (the import caches it)
-    from lesson_generator.domains import _REGISTRY
 
-    _REGISTRY.pop("_test_graph", None)
+
+@pytest.fixture()
+def _register_test_domain(
+    tmp_path: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Register a temporary test domain in a per-test copy of the registry.
+
+    The domain's ``src`` lesson dir is left uncreated: a missing lesson
+    dir lists no lessons, exactly like an empty one.
+    """
+    monkeypatch.setattr(domains, "_REGISTRY", dict(domains._REGISTRY))
+    _register(_test_domain(tmp_path))
+
+
+class SuccessRun(t.NamedTuple):
+    """Shared outcome of the module's successful graph run."""
+
+    result: dict[str, t.Any]
+    output: pathlib.Path | None
+    """Resolved ``output_path``, or ``None`` if the run wrote nothing."""
+    target: pathlib.Path
+    """Resolved ``target_dir`` the run was given."""
+
+
+@pytest.fixture(scope="module")
+def success_result(
+    tmp_path_factory: pytest.TempPathFactory,
+    graph_factory: GraphFactory,
+) -> SuccessRun:
+    """Run the graph once on valid code and resolve its paths once.
+
+    The topic contains path traversal, so this one run covers both the
+    success path and filename sanitizing.
+    """
+    project = tmp_path_factory.mktemp("graph_project")
+    target = tmp_path_factory.mktemp("graph_out").resolve()
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(domains, "_REGISTRY", dict(domains._REGISTRY))
+        _register(_test_domain(project))
+        result = graph_factory((VALID_LESSON,)).invoke(
+            {
+                "topic": "foo/../../../escape",
+                "domain_name": "_test_graph",
+                "target_dir": str(target),
+                "max_iterations": 3,
+            },
+        )
+    output_path = result.get("output_path")
+    output = pathlib.Path(output_path).resolve() if output_path else None
+    return SuccessRun(result, output, target)
 
 
 @pytest.mark.usefixtures("_register_test_domain")
@@ -77,45 +156,47 @@ def test_graph_compiles() -> None:
 
 
 @pytest.mark.usefixtures("_register_test_domain")
-def test_graph_has_expected_nodes() -> None:
+def test_graph_has_expected_nodes(graph_factory: GraphFactory) -> None:
     """Graph should contain all pipeline nodes."""
-    model = FakeListChatModel(responses=[VALID_LESSON])
-    graph = _build_graph(model)
-    node_names = set(graph.get_graph().nodes)
-    expected = {
-        "load_context",
-        "generate_lesson",
-        "validate_lesson",
-        "fix_lesson",
-        "write_output",
-        START,
-        END,
-    }
-    assert expected == node_names
+    graph = graph_factory((VALID_LESSON,))
+    assert graph.get_graph().nodes.keys() == EXPECTED_NODES
 
 
-@pytest.mark.usefixtures("_register_test_domain")
-def test_graph_success_path(tmp_path: pathlib.Path) -> None:
+@pytest.mark.slow
+def test_graph_success_path_committed(success_result: SuccessRun) -> None:
     """Valid code should flow through to committed status."""
-    model = FakeListChatModel(responses=[VALID_LESSON])
-    graph = _build_graph(model)
-    result = graph.invoke(
-        {
-            "topic": "test concept",
-            "domain_name": "_test_graph",
-            "target_dir": str(tmp_path),
-            "max_iterations": 3,
-        },
-    )
-    assert result["status"] == "committed"
-    assert pathlib.Path(result["output_path"]).exists()
+    assert success_result.result["status"] == "committed"
+
 
+@pytest.mark.slow
+def test_graph_success_path_writes_output(success_result: SuccessRun) -> None:
+    """A committed run should leave the lesson file on disk."""
+    assert success_result.output is not None
+    assert success_result.output.exists()
 
+
+@pytest.mark.slow
+def test_graph_output_inside_target_dir(success_result: SuccessRun) -> None:
+    """A topic with path traversal must not escape target_dir."""
+    assert success_result.output is not None
+    assert success_result.output.is_relative_to(success_result.target)
+
+
+@pytest.mark.slow
+def test_graph_topic_sanitized_in_filename(success_result: SuccessRun) -> None:
+    """Topics with path traversal characters should be sanitized."""
+    assert success_result.output is not None
+    assert "/" not in success_result.output.name
+    assert ".." not in success_result.output.name
+
+
+@pytest.mark.slow
 @pytest.mark.usefixtures("_register_test_domain")
-def test_graph_dry_run_skips_write(tmp_path: pathlib.Path) -> None:
+def test_graph_dry_run_skips_write(
+    tmp_path: pathlib.Path, graph_factory: GraphFactory
+) -> None:
     """dry_run=True should skip writing and return status 'dry_run'."""
-    model = FakeListChatModel(responses=[VALID_LESSON])
-    graph = _build_graph(model)
+    graph = graph_factory((VALID_LESSON,))
     result = graph.invoke(
         {
             "topic": "test concept",
@@ -131,11 +212,13 @@ def test_graph_dry_run_skips_write(tmp_path: pathlib.Path) -> None:
     assert py_files == []
 
 
+@pytest.mark.slow
 @pytest.mark.usefixtures("_register_test_domain")
-def test_graph_force_overwrites_existing(tmp_path: pathlib.Path) -> None:
+def test_graph_force_overwrites_existing(
+    tmp_path: pathlib.Path, graph_factory: GraphFactory
+) -> None:
     """force=True should overwrite an existing lesson file."""
-    model = FakeListChatModel(responses=[VALID_LESSON])
-    graph = _build_graph(model)
+    graph = graph_factory((VALID_LESSON,))
     # Create an existing file that will collide
     result = graph.invoke(
         {
@@ -150,9 +233,7 @@ def test_graph_force_overwrites_existing(tmp_path: pathlib.Path) -> None:
     assert existing_path.exists()
 
     # Re-run with force — should overwrite
-    model2 = FakeListChatModel(responses=[VALID_LESSON])
-    graph2 = _build_graph(model2)
-    result2 = graph2.invoke(
+    result2 = graph.invoke(
         {
             "topic": "test concept",
             "domain_name": "_test_graph",
@@ -164,55 +245,75 @@ def test_graph_force_overwrites_existing(tmp_path: pathlib.Path) -> None:
     assert result2["status"] == "committed"
 
 
-@pytest.mark.usefixtures("_register_test_domain")
-def test_graph_topic_sanitized_in_filename(tmp_path: pathlib.Path) -> None:
-    """Topics with path traversal characters should be sanitized."""
-    model = FakeListChatModel(responses=[VALID_LESSON])
-    graph = _build_graph(model)
-    result = graph.invoke(
-        {
-            "topic": "foo/../../../escape",
-            "domain_name": "_test_graph",
-            "target_dir": str(tmp_path),
-            "max_iterations": 3,
-        },
-    )
-    assert result["status"] == "committed"
-    output = pathlib.Path(result["output_path"])
-    # File must be inside target_dir
-    assert output.resolve().is_relative_to(tmp_path.resolve())
-    # Filename must not contain path separators
-    assert "/" not in output.name
-    assert ".." not in output.name
-
-
 @pytest.mark.usefixtures("_register_test_domain")
 def test_graph_file_exists_returns_failed(tmp_path: pathlib.Path) -> None:
     """FileExistsError in write_output should return status='failed'."""
-    from lesson_generator.models import LessonMetadata
     from lesson_generator.nodes import write_output
 
     # Pre-create the collision file
     (tmp_path / "001_topic.py").write_text("# existing", encoding="utf-8")
 
-    metadata = LessonMetadata(number=1, title="topic", filename="001_topic.py")
     state: LessonGeneratorState = {
         "validation_ok": True,
         "domain_name": "_test_graph",
         "target_dir": str(tmp_path),
         "rendered_code": "# new content",
-        "metadata_json": metadata.model_dump_json(),
+        "metadata": {"number": 1, "title": "topic", "filename": "001_topic.py"},
     }
     result = write_output(state)
     assert result["status"] == "failed"
 
 
 @pytest.mark.usefixtures("_register_test_domain")
-def test_graph_strips_code_fences(tmp_path: pathlib.Path) -> None:
+def test_write_output_rejects_path_traversal(tmp_path: pathlib.Path) -> None:
+    """A filename escaping the resolved target dir should fail the write."""
+    from lesson_generator.nodes import write_output
+
+    target_dir = tmp_path / "out"
+    target_dir.mkdir()
+    state: LessonGeneratorState = {
+        "validation_ok": True,
+        "domain_name": "_test_graph",
+        "resolved_target_dir": str(target_dir.resolve()),
+        "rendered_code": "# escaped",
+        "metadata": {"number": 1, "title": "escape", "filename": "../001_escape.py"},
+    }
+    result = write_output(state)
+    assert result["status"] == "failed"
+    assert not (tmp_path / "001_escape.py").exists()
+
+
+@pytest.mark.usefixtures("_register_test_domain")
+def test_write_output_rejects_symlink_escape(tmp_path: pathlib.Path) -> None:
+    """A lesson file symlinked outside the target dir should not be written."""
+    from lesson_generator.nodes import write_output
+
+    target_dir = tmp_path / "out"
+    target_dir.mkdir()
+    outside = tmp_path / "outside.py"
+    outside.write_text("# outside", encoding="utf-8")
+    (target_dir / "001_escape.py").symlink_to(outside)
+    state: LessonGeneratorState = {
+        "validation_ok": True,
+        "domain_name": "_test_graph",
+        "resolved_target_dir": str(target_dir.resolve()),
+        "rendered_code": "# escaped",
+        "force": True,
+        "metadata": {"number": 1, "title": "escape", "filename": "001_escape.py"},
+    }
+    result = write_output(state)
+    assert result["status"] == "failed"
+    assert outside.read_text(encoding="utf-8") == "# outside"
+
+
+@pytest.mark.slow
+@pytest.mark.usefixtures("_register_test_domain")
+def test_graph_strips_code_fences(
+    tmp_path: pathlib.Path, graph_factory: GraphFactory
+) -> None:
     """LLM output wrapped in markdown fences should be stripped and committed."""
     fenced = f"```python\n{VALID_LESSON}\n```"
-    model = FakeListChatModel(responses=[fenced])
-    graph = _build_graph(model)
+    graph = graph_factory((fenced,))
     result = graph.invoke(
         {
             "topic": "fenced output",
@@ -228,10 +329,12 @@ def test_graph_strips_code_fences(tmp_path: pathlib.Path) -> None:
     assert not content.rstrip().endswith("```")
 
 
+@pytest.mark.slow
 @pytest.mark.usefixtures("_register_test_domain")
 def test_graph_default_target_dir(
     tmp_path: pathlib.Path,
     monkeypatch: pytest.MonkeyPatch,
+    graph_factory: GraphFactory,
 ) -> None:
     """Omitting target_dir should fall back to deterministic temp dir."""
     fake_tmp = tmp_path / "faketmp"
@@ -240,8 +343,7 @@ def test_graph_default_target_dir(
         "lesson_generator.tools.tempfile.gettempdir", lambda: str(fake_tmp)
     )
     monkeypatch.setattr("lesson_generator.tools.getpass.getuser", lambda: "testuser")
-    model = FakeListChatModel(responses=[VALID_LESSON])
-    graph = _build_graph(model)
+    graph = graph_factory((VALID_LESSON,))
     result = graph.invoke(
         {
             "topic": "default dir",
@@ -259,13 +361,13 @@ def test_graph_default_target_dir(
 
 
 @pytest.mark.usefixtures("_register_test_domain")
-def test_graph_max_retries_respected(tmp_path: pathlib.Path) -> None:
+def test_graph_max_retries_respected(
+    tmp_path: pathlib.Path, graph_factory: GraphFactory
+) -> None:
     """After max retries, should stop retrying."""
     bad_code = "def broken( -> None:\n    pass"
-    # Provide enough responses for generate + max_retries fixes
-    responses = [bad_code] * 5
-    model = FakeListChatModel(responses=responses)
-    graph = _build_graph(model)
+    # The fake model repeats its only response for generate and every fix
+    graph = graph_factory((bad_code,))
     result = graph.invoke(
         {
             "topic": "broken",
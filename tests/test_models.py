@@ -3,7 +3,11 @@
 from __future__ import annotations
 
 import pathlib
+import typing as t
 
+import pytest
+
+from lesson_generator import models
 from lesson_generator.models import (
     DomainConfig,
     LessonMetadata,
@@ -31,55 +35,112 @@ def test_project_type_values() -> None:
     assert ProjectType.APP_BASED.value == "app_based"
 
 
-def test_domain_config_minimal() -> None:
-    """DomainConfig with only required fields should use sensible defaults."""
-    config = DomainConfig(
-        name="test",
-        pedagogy=PedagogyStyle.CONCEPT_FIRST,
-        project_type=ProjectType.LESSON_BASED,
-    )
-    assert config.name == "test"
-    assert config.project_path is None
-    assert config.lesson_dir == "src/"
-    assert config.strict_mypy is True
-    assert config.source_refs == {}
-
-
-def test_domain_config_full(tmp_path: pathlib.Path) -> None:
-    """DomainConfig with all fields should store them correctly."""
-    config = DomainConfig(
-        name="dsa",
-        pedagogy=PedagogyStyle.CONCEPT_FIRST,
-        project_type=ProjectType.LESSON_BASED,
-        project_path=tmp_path,
-        lesson_dir="src/algorithms",
-        template_path="notes/template.py",
-        source_refs={"cpython": "/study/c/cpython"},
-        strict_mypy=True,
-        doctest_strategy="deterministic",
-    )
-    assert config.project_path == tmp_path
-    assert config.source_refs["cpython"] == "/study/c/cpython"
-
-
-def test_lesson_metadata_minimal() -> None:
-    """LessonMetadata with only required fields should default optional ones."""
-    meta = LessonMetadata(number=1, title="Intro", filename="001_intro.py")
-    assert meta.prerequisites == []
-    assert meta.narrative == ""
-
-
-def test_lesson_metadata_full() -> None:
-    """LessonMetadata with all fields should store them correctly."""
-    meta = LessonMetadata(
-        number=3,
-        title="Hash Tables",
-        filename="003_hash_tables.py",
-        prerequisites=["001_intro", "002_arrays"],
-        narrative="Building on arrays...",
-    )
-    assert len(meta.prerequisites) == 2
-    assert meta.narrative.startswith("Building")
+class DomainConfigCase(t.NamedTuple):
+    """Parametrized test case for DomainConfig construction."""
+
+    test_id: str
+    kwargs: dict[str, t.Any]
+    expected: dict[str, t.Any]
+
+
+DOMAIN_CONFIG_CASES: list[DomainConfigCase] = [
+    DomainConfigCase(
+        test_id="minimal_uses_defaults",
+        kwargs={
+            "name": "test",
+            "pedagogy": PedagogyStyle.CONCEPT_FIRST,
+            "project_type": ProjectType.LESSON_BASED,
+        },
+        expected={
+            "name": "test",
+            "project_path": None,
+            "lesson_dir": "src/",
+            "strict_mypy": True,
+            "source_refs": {},
+        },
+    ),
+    DomainConfigCase(
+        test_id="full_stores_fields",
+        kwargs={
+            "name": "dsa",
+            "pedagogy": PedagogyStyle.CONCEPT_FIRST,
+            "project_type": ProjectType.LESSON_BASED,
+            "project_path": pathlib.Path("/study/python/learning-dsa"),
+            "lesson_dir": "src/algorithms",
+            "template_path": "notes/template.py",
+            "source_refs": {"cpython": "/study/c/cpython"},
+            "strict_mypy": True,
+            "doctest_strategy": "deterministic",
+        },
+        expected={
+            "project_path": pathlib.Path("/study/python/learning-dsa"),
+            "source_refs": {"cpython": "/study/c/cpython"},
+        },
+    ),
+]
+
+
+@pytest.mark.parametrize(
+    list(DomainConfigCase._fields),
+    DOMAIN_CONFIG_CASES,
+    ids=[c.test_id for c in DOMAIN_CONFIG_CASES],
+)
+def test_domain_config_build(
+    test_id: str,
+    kwargs: dict[str, t.Any],
+    expected: dict[str, t.Any],
+) -> None:
+    """DomainConfig should store given fields and default the rest."""
+    config = DomainConfig(**kwargs)
+    for field, value in expected.items():
+        assert getattr(config, field) == value
+
+
+class LessonMetadataCase(t.NamedTuple):
+    """Parametrized test case for LessonMetadata construction."""
+
+    test_id: str
+    kwargs: dict[str, t.Any]
+    expected: dict[str, t.Any]
+
+
+LESSON_METADATA_CASES: list[LessonMetadataCase] = [
+    LessonMetadataCase(
+        test_id="minimal_uses_defaults",
+        kwargs={"number": 1, "title": "Intro", "filename": "001_intro.py"},
+        expected={"prerequisites": [], "narrative": ""},
+    ),
+    LessonMetadataCase(
+        test_id="full_stores_fields",
+        kwargs={
+            "number": 3,
+            "title": "Hash Tables",
+            "filename": "003_hash_tables.py",
+            "prerequisites": ["001_intro", "002_arrays"],
+            "narrative": "Building on arrays...",
+        },
+        expected={
+            "prerequisites": ["001_intro", "002_arrays"],
+            "narrative": "Building on arrays...",
+        },
+    ),
+]
+
+
+@pytest.mark.parametrize(
+    list(LessonMetadataCase._fields),
+    LESSON_METADATA_CASES,
+    ids=[c.test_id for c in LESSON_METADATA_CASES],
+)
+def test_lesson_metadata_build(
+    test_id: str,
+    kwargs: dict[str, t.Any],
+    expected: dict[str, t.Any],
+) -> None:
+    """LessonMetadata should store given fields and default the rest."""
+    meta = LessonMetadata(**kwargs)
+    for field, value in expected.items():
+        assert getattr(meta, field) == value
 
 
 def test_lesson_metadata_json_roundtrip() -> None:
@@ -109,3 +170,16 @@ def test_validation_result_invalid() -> None:
     )
     assert not result.is_valid
     assert len(result.errors) == 1
+
+
+def test_models_unknown_attribute_raises() -> None:
+    """The lazy models package should still raise AttributeError for typos."""
+    with pytest.raises(AttributeError, match="NoSuchModel"):
+        _ = models.NoSuchModel
+
+
+def test_state_module_reexports_input_schema() -> None:
+    """LessonGeneratorInput should stay importable from its old module."""
+    from lesson_generator.state import LessonGeneratorInput
+
+    assert LessonGeneratorInput is models.LessonGeneratorInput
@@ -6,7 +6,7 @@ import typing as t
 
 import pytest
 
-from lesson_generator.nodes import _strip_code_fences
+from lesson_generator.nodes import _safe_topic, _strip_code_fences
 
 
 class StripFenceCase(t.NamedTuple):
@@ -53,6 +53,16 @@ STRIP_FENCE_CASES: list[StripFenceCase] = [
         raw='```python\n"""A lesson."""\n\ndef main() -> None:\n    pass',
         expected='```python\n"""A lesson."""\n\ndef main() -> None:\n    pass',
     ),
+    StripFenceCase(
+        test_id="only_closing_fence_no_strip",
+        raw='"""A lesson."""\n\ndef main() -> None:\n    pass\n```',
+        expected='"""A lesson."""\n\ndef main() -> None:\n    pass\n```',
+    ),
+    StripFenceCase(
+        test_id="inner_fence_kept_outer_stripped",
+        raw='```python\n"""Example.\n\n```\nx = 1\n```\n"""\n```',
+        expected='"""Example.\n\n```\nx = 1\n```\n"""',
+    ),
     StripFenceCase(
         test_id="backticks_inside_docstring_preserved",
         raw=(
@@ -83,5 +93,56 @@ def test_strip_code_fences(
     raw: str,
     expected: str,
 ) -> None:
-    """_strip_code_fences should remove outer markdown fences only."""
+    """_strip_code_fences should remove outer markdown fences only, once."""
     assert _strip_code_fences(raw) == expected
+
+
+class SafeTopicCase(t.NamedTuple):
+    """Parametrized test case for _safe_topic."""
+
+    test_id: str
+    topic: str
+    expected: str
+
+
+SAFE_TOPIC_CASES: list[SafeTopicCase] = [
+    SafeTopicCase(
+        test_id="spaces_lowercased",
+        topic="Binary Search",
+        expected="binary_search",
+    ),
+    SafeTopicCase(
+        test_id="path_traversal",
+        topic="foo/../../../escape",
+        expected="foo_escape",
+    ),
+    SafeTopicCase(
+        test_id="underscore_runs_and_edges",
+        topic="__hash   tables__",
+        expected="hash_tables",
+    ),
+    SafeTopicCase(
+        test_id="non_ascii_replaced",
+        topic="café au lait",
+        expected="caf_au_lait",
+    ),
+    SafeTopicCase(
+        test_id="digits_kept",
+        topic="B-tree 2-3-4",
+        expected="b_tree_2_3_4",
+    ),
+]
+
+
+@pytest.mark.parametrize(
+    list(SafeTopicCase._fields),
+    SAFE_TOPIC_CASES,
+    ids=[c.test_id for c in SAFE_TOPIC_CASES],
+)
+def test_safe_topic(
+    test_id: str,
+    topic: str,
+    expected: str,
+) -> None:
+    """_safe_topic should produce a ``[a-z0-9_]`` slug without edge underscores."""
+    assert _safe_topic(topic) == expected
@@ -2,10 +2,15 @@
 
 from __future__ import annotations
 
+import os
 import pathlib
+import subprocess
+import time
+import typing as t
 
 import pytest
 
+from lesson_generator import tools
 from lesson_generator.models import DomainConfig, PedagogyStyle, ProjectType
 from lesson_generator.tools import (
     list_existing_lessons,
@@ -26,31 +31,54 @@ def test_read_template_reads_project_template(
     assert "Template" in result
 
 
-def test_read_template_fallback_when_no_project() -> None:
-    """read_template should fall back to built-in when no project_path set."""
-    config = DomainConfig(
-        name="noproject",
-        pedagogy=PedagogyStyle.CONCEPT_FIRST,
-        project_type=ProjectType.LESSON_BASED,
+def test_read_template_rereads_after_edit(
+    test_domain_config: DomainConfig,
+    mock_project_dir_rw: pathlib.Path,
+) -> None:
+    """read_template should return fresh content once the template changes."""
+    config = test_domain_config.model_copy(
+        update={"project_path": mock_project_dir_rw},
     )
-    result = read_template(config)
-    assert "demonstrate_concept" in result
+    assert "Template" in read_template(config)
+    template = mock_project_dir_rw / "notes" / "lesson_template.py"
+    template.write_text('"""Edited."""\n', encoding="utf-8")
+    st = template.stat()
+    os.utime(template, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert read_template(config) == '"""Edited."""\n'
+
+
+class ReadTemplateFallbackCase(t.NamedTuple):
+    """Parametrized test case for read_template's built-in fallback."""
+
+    test_id: str
+    with_project: bool
 
 
-def test_read_template_fallback_when_template_missing(
+READ_TEMPLATE_FALLBACK_CASES: list[ReadTemplateFallbackCase] = [
+    ReadTemplateFallbackCase(test_id="no_project_path", with_project=False),
+    ReadTemplateFallbackCase(test_id="template_file_missing", with_project=True),
+]
+
+
+@pytest.mark.parametrize(
+    list(ReadTemplateFallbackCase._fields),
+    READ_TEMPLATE_FALLBACK_CASES,
+    ids=[c.test_id for c in READ_TEMPLATE_FALLBACK_CASES],
+)
+def test_read_template_fallback(
+    test_id: str,
+    with_project: bool,
     tmp_path: pathlib.Path,
 ) -> None:
-    """read_template should fall back to built-in when template file is absent."""
+    """read_template should fall back to built-in when no template is found."""
     config = DomainConfig(
         name="test",
         pedagogy=PedagogyStyle.CONCEPT_FIRST,
         project_type=ProjectType.LESSON_BASED,
-        project_path=tmp_path,
+        project_path=tmp_path if with_project else None,
         template_path="nonexistent.py",
     )
-    result = read_template(config)
-    # Should fall back to built-in
-    assert "demonstrate_concept" in result
+    assert "demonstrate_concept" in read_template(config)
 
 
 def test_list_existing_lessons_lists_py_files(
@@ -98,6 +126,27 @@ def test_list_existing_lessons_handles_nested_dirs(
     assert any("001_nested.py" in lesson for lesson in lessons)
 
 
+def test_list_existing_lessons_sorted_and_skips_pycache(
+    tmp_path: pathlib.Path,
+) -> None:
+    """list_existing_lessons should sort like pathlib and skip __pycache__."""
+    src = tmp_path / "src"
+    (src / "a").mkdir(parents=True)
+    (src / "__pycache__").mkdir()
+    (src / "a.py").write_text("", encoding="utf-8")
+    (src / "a" / "b.py").write_text("", encoding="utf-8")
+    (src / "__pycache__" / "stray.py").write_text("", encoding="utf-8")
+    lessons = list_existing_lessons(
+        DomainConfig(
+            name="sorted",
+            pedagogy=PedagogyStyle.CONCEPT_FIRST,
+            project_type=ProjectType.LESSON_BASED,
+        ),
+        target_dir=src,
+    )
+    assert lessons == [str(pathlib.Path("a", "b.py")), "a.py"]
+
+
 def test_next_lesson_number_next_after_existing(
     test_domain_config: DomainConfig,
 ) -> None:
@@ -106,20 +155,50 @@ def test_next_lesson_number_next_after_existing(
     assert num == 3  # 001 and 002 exist
 
 
+class OverrideLessonNumberCase(t.NamedTuple):
+    """Parametrized test case for next_lesson_number with a target_dir."""
+
+    test_id: str
+    filenames: tuple[str, ...]
+    expected: int
+
+
+OVERRIDE_LESSON_NUMBER_CASES: list[OverrideLessonNumberCase] = [
+    OverrideLessonNumberCase(
+        test_id="one_past_highest",
+        filenames=("001_a.py", "005_b.py"),
+        expected=6,
+    ),
+    OverrideLessonNumberCase(
+        # Numbers past 999 count in full; unnumbered files are ignored.
+        test_id="whole_digit_prefix",
+        filenames=("999_a.py", "1000_b.py", "notes.py"),
+        expected=1001,
+    ),
+]
+
+
+@pytest.mark.parametrize(
+    list(OverrideLessonNumberCase._fields),
+    OVERRIDE_LESSON_NUMBER_CASES,
+    ids=[c.test_id for c in OVERRIDE_LESSON_NUMBER_CASES],
+)
 def test_next_lesson_number_override_target_dir(
+    test_id: str,
+    filenames: tuple[str, ...],
+    expected: int,
     tmp_path: pathlib.Path,
 ) -> None:
     """target_dir override should scan the override dir, not config."""
-    override = tmp_path / "custom"
-    override.mkdir()
-    (override / "001_a.py").write_text("# a", encoding="utf-8")
-    (override / "005_b.py").write_text("# b", encoding="utf-8")
+    for filename in filenames:
+        # Only the names matter, so skip writing any content.
+        (tmp_path / filename).touch()
     config = DomainConfig(
         name="test",
         pedagogy=PedagogyStyle.CONCEPT_FIRST,
         project_type=ProjectType.LESSON_BASED,
     )
-    assert next_lesson_number(config, target_dir=override) == 6
+    assert next_lesson_number(config, target_dir=tmp_path) == expected
 
 
 def test_next_lesson_number_starts_at_one_when_empty(
@@ -138,13 +217,19 @@ def test_next_lesson_number_starts_at_one_when_empty(
     assert next_lesson_number(config) == 1
 
 
+@pytest.mark.slow
 def test_validate_in_temp_valid_code() -> None:
     """validate_in_temp should run all validation tools on valid code."""
     code = (
         '"""Valid module."""\n\n'
         "from __future__ import annotations\n\n\n"
         "def main() -> None:\n"
-        '    """Run."""\n'
+        '    """Run.\n\n'
+        "    Examples\n"
+        "    --------\n"
+        "    >>> main()\n"
+        "    hello\n"
+        '    """\n'
         '    print("hello")\n'
     )
     config = DomainConfig(
@@ -162,74 +247,192 @@ def test_validate_in_temp_valid_code() -> None:
     assert "pytest" in result.tools_run
 
 
-def test_validate_in_temp_syntax_error() -> None:
-    """validate_in_temp should detect syntax errors."""
-    code = "def broken(\n"
+@pytest.mark.slow
+def test_validate_in_temp_failing_doctest() -> None:
+    """validate_in_temp should detect failing doctests."""
+    code = (
+        '"""Module with bad doctest."""\n\n'
+        "from __future__ import annotations\n\n\n"
+        "def add(a: int, b: int) -> int:\n"
+        '    """Add two numbers.\n\n'
+        "    Examples\n"
+        "    --------\n"
+        "    >>> add(1, 2)\n"
+        "    999\n"
+        '    """\n'
+        "    return a + b\n"
+    )
     config = DomainConfig(
         name="test",
         pedagogy=PedagogyStyle.CONCEPT_FIRST,
         project_type=ProjectType.LESSON_BASED,
+        strict_mypy=False,
     )
     result = validate_in_temp(code, config)
     assert not result.is_valid
-    assert any("Syntax" in e for e in result.errors)
+    assert "pytest" in result.tools_run
+    assert any("pytest" in e for e in result.errors)
 
 
-def test_validate_in_temp_normalizes_formatting() -> None:
-    """validate_in_temp should auto-format code and return normalized_code."""
-    # Extra blank lines that ruff format will remove
-    code = (
-        '"""Valid module."""\n\n'
-        "from __future__ import annotations\n\n\n\n\n"
-        "def main() -> None:\n"
-        '    """Run."""\n'
-        '    print("hello")\n'
-    )
+_CLEAN_CODE = (
+    '"""Valid module."""\n\n'
+    "from __future__ import annotations\n\n\n"
+    "def main() -> None:\n"
+    '    """Run."""\n'
+    '    print("hello")\n'
+)
+
+
+class ValidateInTempCase(t.NamedTuple):
+    """Parametrized test case for validate_in_temp outcomes."""
+
+    test_id: str
+    code: str
+    config_kwargs: dict[str, t.Any]
+    expect_valid: bool
+    expect_pytest: bool
+    expect_import: bool
+    expect_normalized: bool
+    expect_error: str | None
+
+
+VALIDATE_IN_TEMP_CASES: list[ValidateInTempCase] = [
+    ValidateInTempCase(
+        test_id="clean_code_without_doctests",
+        code=_CLEAN_CODE,
+        config_kwargs={},
+        expect_valid=True,
+        expect_pytest=False,
+        expect_import=True,
+        expect_normalized=False,
+        expect_error=None,
+    ),
+    ValidateInTempCase(
+        test_id="syntax_error",
+        code="def broken(\n",
+        config_kwargs={},
+        expect_valid=False,
+        expect_pytest=False,
+        expect_import=False,
+        expect_normalized=False,
+        expect_error="Syntax",
+    ),
+    ValidateInTempCase(
+        # Extra blank lines that ruff format will remove
+        test_id="normalizes_formatting",
+        code=_CLEAN_CODE.replace("\n\n\ndef", "\n\n\n\n\ndef"),
+        config_kwargs={},
+        expect_valid=True,
+        expect_pytest=False,
+        expect_import=True,
+        expect_normalized=True,
+        expect_error=None,
+    ),
+    ValidateInTempCase(
+        test_id="doctest_strategy_skip",
+        code=_CLEAN_CODE.replace(
+            '"""Run."""',
+            '"""Run.\n\n    >>> main()\n    hello\n    """',
+        ),
+        config_kwargs={"doctest_strategy": "skip"},
+        expect_valid=True,
+        expect_pytest=False,
+        expect_import=False,
+        expect_normalized=False,
+        expect_error=None,
+    ),
+    ValidateInTempCase(
+        test_id="module_level_error",
+        code='"""Broken module."""\n\nraise RuntimeError("boom")\n',
+        config_kwargs={},
+        expect_valid=False,
+        expect_pytest=False,
+        expect_import=True,
+        expect_normalized=False,
+        expect_error="RuntimeError: boom",
+    ),
+]
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize(
+    list(ValidateInTempCase._fields),
+    VALIDATE_IN_TEMP_CASES,
+    ids=[c.test_id for c in VALIDATE_IN_TEMP_CASES],
+)
+def test_validate_in_temp(
+    test_id: str,
+    code: str,
+    config_kwargs: dict[str, t.Any],
+    expect_valid: bool,
+    expect_pytest: bool,
+    expect_import: bool,
+    expect_normalized: bool,
+    expect_error: str | None,
+) -> None:
+    """validate_in_temp should report validity, tools run, and formatting."""
     config = DomainConfig(
         name="test",
         pedagogy=PedagogyStyle.CONCEPT_FIRST,
         project_type=ProjectType.LESSON_BASED,
         strict_mypy=False,
+        **config_kwargs,
     )
     result = validate_in_temp(code, config)
-    assert result.is_valid
-    assert result.normalized_code is not None
-    assert result.normalized_code != code
-
-
-def test_validate_in_temp_no_normalize_when_already_formatted() -> None:
-    """validate_in_temp should not set normalized_code when code is clean."""
-    code = (
-        '"""Valid module."""\n\n'
-        "from __future__ import annotations\n\n\n"
-        "def main() -> None:\n"
-        '    """Run."""\n'
-        '    print("hello")\n'
-    )
+    assert result.is_valid is expect_valid
+    assert ("pytest" in result.tools_run) is expect_pytest
+    assert ("import" in result.tools_run) is expect_import
+    assert ("pytest (skipped: no doctests)" in result.tools_run) is expect_import
+    if expect_normalized:
+        assert result.normalized_code is not None
+        assert result.normalized_code != code
+    else:
+        assert result.normalized_code is None
+    if expect_error is not None:
+        assert any(expect_error in e for e in result.errors)
+
+
+@pytest.mark.slow
+def test_validate_in_temp_memoizes_results(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Re-validating unchanged code should not run the tools again."""
     config = DomainConfig(
         name="test",
         pedagogy=PedagogyStyle.CONCEPT_FIRST,
         project_type=ProjectType.LESSON_BASED,
         strict_mypy=False,
     )
-    result = validate_in_temp(code, config)
-    assert result.is_valid
-    assert result.normalized_code is None
+    code = "x = 1\n"
+    first = validate_in_temp(code, config)
 
+    def fail_run(argv: list[str], **kwargs: t.Any) -> t.Any:
+        pytest.fail(f"unexpected tool run: {argv}")
 
-def test_validate_in_temp_failing_doctest() -> None:
-    """validate_in_temp should detect failing doctests."""
+    monkeypatch.setattr("lesson_generator.tools.subprocess.run", fail_run)
+    second = validate_in_temp(code, config)
+    assert second == first
+    assert second is not first
+
+
+@pytest.mark.slow
+def test_validate_in_temp_reports_timeout_alongside_other_tools(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A timed-out check should not hide results from the concurrent ones."""
+    real_run = subprocess.run
+
+    def fake_run(argv: list[str], **kwargs: t.Any) -> t.Any:
+        # Only the check itself; daemon start/stop calls pass through.
+        if "mypy" in " ".join(argv) and any("lesson_" in arg for arg in argv):
+            raise subprocess.TimeoutExpired(argv, kwargs["timeout"])
+        return real_run(argv, **kwargs)
+
+    monkeypatch.setattr("lesson_generator.tools.subprocess.run", fake_run)
     code = (
-        '"""Module with bad doctest."""\n\n'
+        '"""Valid module."""\n\n'
         "from __future__ import annotations\n\n\n"
-        "def add(a: int, b: int) -> int:\n"
-        '    """Add two numbers.\n\n'
-        "    Examples\n"
-        "    --------\n"
-        "    >>> add(1, 2)\n"
-        "    999\n"
-        '    """\n'
-        "    return a + b\n"
+        "def main() -> None:\n"
+        '    """Run."""\n'
+        '    print("hello")\n'
     )
     config = DomainConfig(
         name="test",
@@ -239,29 +442,64 @@ def test_validate_in_temp_failing_doctest() -> None:
     )
     result = validate_in_temp(code, config)
     assert not result.is_valid
-    assert "pytest" in result.tools_run
-    assert any("pytest" in e for e in result.errors)
+    assert result.errors == ["mypy: timed out after 120s"]
+    assert result.tools_run == [
+        "compile",
+        "ruff_format",
+        "ruff",
+        "mypy",
+        "import",
+        "pytest (skipped: no doctests)",
+    ]
+    assert not tools._VALIDATION_CACHE
+
+
+@pytest.mark.slow
+def test_validate_in_temp_tools_share_one_deadline(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Checks run after ruff format should only get the budget left over."""
+    real_run = subprocess.run
+    timeouts: list[float] = []
 
+    def fake_run(argv: list[str], **kwargs: t.Any) -> t.Any:
+        if any("lesson_" in arg for arg in argv):
+            timeouts.append(kwargs["timeout"])
+        return real_run(argv, **kwargs)
 
-def test_validate_in_temp_skips_doctest_when_configured() -> None:
-    """validate_in_temp should skip pytest when doctest_strategy='skip'."""
-    code = (
-        '"""Valid module."""\n\n'
-        "from __future__ import annotations\n\n\n"
-        "def main() -> None:\n"
-        '    """Run."""\n'
-        '    print("hello")\n'
-    )
+    monkeypatch.setattr("lesson_generator.tools.subprocess.run", fake_run)
     config = DomainConfig(
         name="test",
         pedagogy=PedagogyStyle.CONCEPT_FIRST,
         project_type=ProjectType.LESSON_BASED,
         strict_mypy=False,
-        doctest_strategy="skip",
     )
-    result = validate_in_temp(code, config)
-    assert result.is_valid
-    assert "pytest" not in result.tools_run
+    validate_in_temp('"""Valid module."""\n', config)
+    fmt_timeout, *check_timeouts = timeouts
+    assert fmt_timeout <= 120
+    assert len(check_timeouts) == 3
+    assert all(timeout < fmt_timeout for timeout in check_timeouts)
+
+
+def test_mypy_argv_retries_after_failed_daemon_start(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A failed dmypy start should fall back once, not for the process."""
+    starts: list[float] = []
+
+    def fake_start(flags: tuple[str, ...], *, deadline: float) -> str | None:
+        starts.append(deadline)
+        return None if len(starts) == 1 else "dmypy-strict.json"
+
+    monkeypatch.setattr(tools, "_DMYPY_STATUS_FILES", {})
+    monkeypatch.setattr(tools, "_start_dmypy", fake_start)
+    deadline = time.monotonic() + 10
+    cold = tools._mypy_argv(strict=True, deadline=deadline)
+    warm = tools._mypy_argv(strict=True, deadline=deadline)
+    tools._mypy_argv(strict=True, deadline=deadline)
+    assert cold[1:3] == ("-m", "mypy")
+    assert "run" in warm
+    assert starts == [deadline, deadline]
 
 
 def test_write_lesson_creates_file(tmp_path: pathlib.Path) -> None:
@@ -278,6 +516,13 @@ def test_write_lesson_creates_parent_dirs(tmp_path: pathlib.Path) -> None:
     assert path.exists()
 
 
+def test_write_lesson_force_creates_parent_dirs(tmp_path: pathlib.Path) -> None:
+    """write_lesson with force=True should also create missing directories."""
+    path = tmp_path / "deep" / "nested" / "001_test.py"
+    write_lesson(path, "# test", force=True)
+    assert path.read_text() == "# test"
+
+
 def test_write_lesson_overwrite_protection(tmp_path: pathlib.Path) -> None:
     """write_lesson should raise FileExistsError without --force."""
     path = tmp_path / "001_test.py"
@@ -294,6 +539,51 @@ def test_write_lesson_force_overwrite(tmp_path: pathlib.Path) -> None:
     assert path.read_text() == "new content"
 
 
+def test_write_lesson_force_leaves_no_temp_files(tmp_path: pathlib.Path) -> None:
+    """write_lesson with force=True should rename its temp file into place."""
+    path = tmp_path / "001_test.py"
+    path.write_text("original")
+    write_lesson(path, "new content", force=True)
+    assert [p.name for p in tmp_path.iterdir()] == ["001_test.py"]
+
+
+def test_write_lesson_new_file_mode_follows_umask(tmp_path: pathlib.Path) -> None:
+    """New lessons should get 0o666 minus the umask, like write_text."""
+    old_umask = os.umask(0o002)
+    try:
+        path = tmp_path / "001_test.py"
+        write_lesson(path, "# test")
+    finally:
+        os.umask(old_umask)
+    assert path.stat().st_mode & 0o777 == 0o664
+
+
+def test_write_lesson_force_keeps_mode(tmp_path: pathlib.Path) -> None:
+    """write_lesson with force=True should keep the old file's permissions."""
+    path = tmp_path / "001_test.py"
+    path.write_text("original")
+    path.chmod(0o600)
+    write_lesson(path, "new content", force=True)
+    assert path.stat().st_mode & 0o777 == 0o600
+
+
+def test_write_lesson_force_writes_through_symlink(tmp_path: pathlib.Path) -> None:
+    """write_lesson with force=True should update an in-root symlink's target.
+
+    Links escaping the lesson root are rejected by ``write_output`` before
+    ``write_lesson`` runs; see ``test_write_output_rejects_symlink_escape``.
+    """
+    target = tmp_path / "real.py"
+    target.write_text("original")
+    link = tmp_path / "001_test.py"
+    link.symlink_to(target)
+    assert link.resolve().is_relative_to(tmp_path.resolve())
+    write_lesson(link, "new content", force=True)
+    assert link.is_symlink()
+    assert target.read_text() == "new content"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["001_test.py", "real.py"]
+
+
 # ---------------------------------------------------------------------------
 # resolve_output_dir
 # ---------------------------------------------------------------------------